@@ -1,14 +1,115 @@
+import json
 import sqlite3
 import logging
-from datetime import datetime
+import threading
+from collections import namedtuple
+from functools import wraps
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Hot-path statements are kept as module-level constants so that every call
+# passes the same SQL string and hits sqlite3's per-connection statement cache.
+# The pending lookups are pinned to the partial index on unclaimed chunks (see
+# create_tables); the planner would otherwise tie-break onto the larger
+# (job_id, status, chunk_index) index.
+_SQL_PENDING_CHUNK = "SELECT * FROM chunks INDEXED BY idx_chunks_pending WHERE job_id = ? AND status = 'pending' ORDER BY chunk_index ASC LIMIT 1"
+_SQL_CLAIM_CHUNK = """
+    UPDATE chunks SET status = 'processing'
+    WHERE id = (SELECT id FROM chunks INDEXED BY idx_chunks_pending WHERE job_id = ? AND status = 'pending' ORDER BY chunk_index ASC LIMIT 1)
+    RETURNING *
+"""
+_SQL_UPDATE_CHUNK = "UPDATE chunks SET status = ?, audio_file_path = ? WHERE id = ?"
+_SQL_UPDATE_JOB = "UPDATE jobs SET status = ? WHERE id = ?"
+_SQL_JOB_STATUS = "SELECT status FROM jobs WHERE id = ?"
+_SQL_CHUNK_STATUS = "SELECT status FROM chunks WHERE job_id = ? AND chunk_index = ?"
+_SQL_RESETTABLE_COUNT = "SELECT failed_count + processing_count FROM jobs WHERE id = ?"
+_SQL_RESET_CHUNKS = "UPDATE chunks SET status = 'pending', retries = retries + 1 WHERE job_id = ? AND status IN ('failed', 'processing')"
+_SQL_JOB_STATS = """
+    SELECT pending_count, processing_count, completed_count, failed_count,
+           pending_count + processing_count + completed_count + failed_count AS total_count
+    FROM jobs WHERE id = ?
+"""
+
+# Lightweight row type returned by get_all_jobs for the job listing.
+JobSummary = namedtuple("JobSummary", "id job_name status created_at")
+
+# Size of the per-connection prepared statement cache (sqlite3 default is 128).
+_CACHED_STATEMENTS = 256
+
+# Columns added to each table after it was first released, with their column
+# definitions. create_tables adds any that an existing database lacks.
+_ADDED_COLUMNS = {
+    'jobs': {
+        'dtype': "TEXT DEFAULT 'fp32'",
+        'warmup': "BOOLEAN DEFAULT 0",
+        'cache_dir': "TEXT",
+    },
+    'chunks': {
+        'voice': "TEXT",
+    },
+}
+
+# Chunk statuses with a denormalized counter column (`<status>_count`) on jobs.
+# The counters are kept in sync by triggers on the chunks table, so they change
+# in the same transaction as the chunk rows and get_job_stats is a single-row
+# lookup instead of a GROUP BY over every chunk of the job.
+_CHUNK_STATUSES = ('pending', 'processing', 'completed', 'failed')
+
+def _counter_deltas(sign, row):
+    return ",\n".join(
+        f"{s}_count = {s}_count {sign} ({row}.status = '{s}')" for s in _CHUNK_STATUSES
+    )
+
+_SQL_COUNTER_TRIGGERS = f"""
+    CREATE TRIGGER IF NOT EXISTS trg_chunks_count_insert AFTER INSERT ON chunks
+    BEGIN
+        UPDATE jobs SET {_counter_deltas('+', 'NEW')} WHERE id = NEW.job_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_chunks_count_update AFTER UPDATE OF status ON chunks
+    WHEN OLD.status IS NOT NEW.status
+    BEGIN
+        UPDATE jobs SET {_counter_deltas('-', 'OLD')} WHERE id = OLD.job_id;
+        UPDATE jobs SET {_counter_deltas('+', 'NEW')} WHERE id = NEW.job_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_chunks_count_delete AFTER DELETE ON chunks
+    BEGIN
+        UPDATE jobs SET {_counter_deltas('-', 'OLD')} WHERE id = OLD.job_id;
+    END;
+"""
+
+# All writes issued from one process are serialized through this lock, so a
+# connection shared between threads never interleaves two transactions.
+_write_lock = threading.RLock()
+
+# Per-thread read-only connections, keyed by database file. In WAL mode they
+# never block (or get blocked by) the writer.
+_thread_local = threading.local()
+
+def _serialized_write(func):
+    """Decorator that runs a write helper while holding the module write lock."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with _write_lock:
+            return func(*args, **kwargs)
+    return wrapper
+
+def _apply_pragmas(conn):
+    """Applies the per-connection performance PRAGMAs shared by all connections."""
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-65536;")  # 64 MiB page cache
+    conn.execute("PRAGMA mmap_size=1073741824;")  # Read up to 1 GiB via mmap
+    conn.execute("PRAGMA busy_timeout=5000;")
+
 def create_connection(db_file="tts_jobs.db"):
     """Creates and returns a connection to a SQLite database.
 
     This function establishes a connection to the SQLite database file specified.
     It is configured to be thread-safe by setting `check_same_thread=False`.
+    File-backed databases are switched to WAL journal mode with
+    `synchronous=NORMAL`, so readers (e.g. the progress monitor) do not block
+    the workers' writes and each commit avoids a full fsync.
 
     Args:
         db_file: The path to the SQLite database file. Defaults to
@@ -19,12 +120,72 @@ def create_connection(db_file="tts_jobs.db"):
     """
     conn = None
     try:
-        conn = sqlite3.connect(db_file, check_same_thread=False)
-        logger.info(f"Successfully connected to SQLite database: {db_file}")
+        conn = sqlite3.connect(db_file, check_same_thread=False, cached_statements=_CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row
+        # Only takes effect for a brand-new database, so it must precede WAL setup
+        conn.execute("PRAGMA page_size=8192;")
+        if db_file != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA wal_autocheckpoint=1000;")
+        _apply_pragmas(conn)
+        logger.info("Successfully connected to SQLite database: %s", db_file)
     except sqlite3.Error as e:
-        logger.error(f"Error connecting to database: {e}")
+        logger.error("Error connecting to database: %s", e)
+    return conn
+
+def get_reader_connection(db_file="tts_jobs.db"):
+    """Returns the calling thread's read-only connection to the database.
+
+    The connection is opened with `mode=ro` on first use and then reused for
+    every later call from the same thread, so polling readers such as the
+    progress monitor or the web dashboard do not reconnect on every refresh.
+    The database must already exist (see `create_tables`).
+
+    Args:
+        db_file: The path to the SQLite database file. Defaults to
+            "tts_jobs.db".
+
+    Returns:
+        A read-only sqlite3.Connection object or None if the connection fails.
+    """
+    readers = getattr(_thread_local, "readers", None)
+    if readers is None:
+        readers = _thread_local.readers = {}
+    conn = readers.get(db_file)
+    if conn is None:
+        try:
+            uri = f"{Path(db_file).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=_CACHED_STATEMENTS)
+            conn.row_factory = sqlite3.Row
+            _apply_pragmas(conn)
+            readers[db_file] = conn
+            logger.debug("Opened read-only connection to %s for thread %s", db_file, threading.get_ident())
+        except sqlite3.Error as e:
+            logger.error("Error opening read-only connection to database: %s", e)
+            return None
     return conn
 
+def close_reader_connections():
+    """Closes every read-only connection opened by the calling thread."""
+    readers = getattr(_thread_local, "readers", None) or {}
+    for conn in readers.values():
+        conn.close()
+    readers.clear()
+
+def close_connection(conn):
+    """Runs `PRAGMA optimize` and closes the given connection.
+
+    Args:
+        conn: An active sqlite3.Connection object.
+    """
+    try:
+        conn.execute("PRAGMA optimize;")
+    except sqlite3.Error as e:
+        logger.warning("Error optimizing database before close: %s", e)
+    finally:
+        conn.close()
+
+@_serialized_write
 def create_tables(conn):
     """Creates the 'jobs' and 'chunks' tables in the database if they don't exist.
 
@@ -32,8 +193,8 @@ def create_tables(conn):
         conn: An active sqlite3.Connection object.
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute("""
+        # All DDL is parsed and run as one script
+        conn.executescript(f"""
             CREATE TABLE IF NOT EXISTS jobs (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 job_name TEXT NOT NULL UNIQUE,
@@ -56,10 +217,16 @@ def create_tables(conn):
                 max_torch_threads INTEGER DEFAULT 4,
                 max_gpu_memory REAL DEFAULT 0.75,
                 low_priority BOOLEAN DEFAULT 1,
+                dtype TEXT DEFAULT 'fp32',
+                warmup BOOLEAN DEFAULT 0,
+                cache_dir TEXT,
+                pending_count INTEGER NOT NULL DEFAULT 0,
+                processing_count INTEGER NOT NULL DEFAULT 0,
+                completed_count INTEGER NOT NULL DEFAULT 0,
+                failed_count INTEGER NOT NULL DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
-        """)
-        cursor.execute("""
+
             CREATE TABLE IF NOT EXISTS chunks (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 job_id INTEGER NOT NULL,
@@ -68,20 +235,67 @@ def create_tables(conn):
                 status TEXT NOT NULL DEFAULT 'pending',
                 audio_file_path TEXT,
                 retries INTEGER DEFAULT 0,
+                voice TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (job_id) REFERENCES jobs (id),
                 UNIQUE (job_id, chunk_index)
             );
+
+            -- Serves status-filtered lookups such as resetting failed/stuck chunks.
+            -- (job_id, chunk_index) is already covered by the UNIQUE constraint above.
+            CREATE INDEX IF NOT EXISTS idx_chunks_job_status_idx ON chunks(job_id, status, chunk_index);
+
+            -- Only holds unclaimed rows, so the next-pending lookup stays small as a job progresses
+            CREATE INDEX IF NOT EXISTS idx_chunks_pending ON chunks(job_id, chunk_index) WHERE status = 'pending';
+
+            {_SQL_COUNTER_TRIGGERS}
         """)
-        conn.commit()
+        with conn:
+            cursor = conn.cursor()
+            _migrate_added_columns(cursor)
+            _migrate_status_counters(cursor)
         logger.info("Tables 'jobs' and 'chunks' are ready.")
     except sqlite3.Error as e:
-        logger.error(f"Error creating tables: {e}")
+        logger.error("Error creating tables: %s", e)
+
+def _migrate_added_columns(cursor):
+    """Adds the columns introduced after a database was created.
+
+    Args:
+        cursor: A cursor on the connection running `create_tables`.
+    """
+    for table, columns in _ADDED_COLUMNS.items():
+        existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        for column, definition in columns.items():
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                logger.info("Added column '%s' to existing %s table.", column, table)
+
+def _migrate_status_counters(cursor):
+    """Adds and backfills the per-status counter columns on databases created
+    before they existed.
 
+    Args:
+        cursor: A cursor on the connection running `create_tables`.
+    """
+    existing = {row[1] for row in cursor.execute("PRAGMA table_info(jobs)")}
+    missing = [s for s in _CHUNK_STATUSES if f"{s}_count" not in existing]
+    if not missing:
+        return
+    for status in missing:
+        cursor.execute(f"ALTER TABLE jobs ADD COLUMN {status}_count INTEGER NOT NULL DEFAULT 0")
+    cursor.execute("UPDATE jobs SET " + ", ".join(
+        f"{s}_count = (SELECT COUNT(*) FROM chunks WHERE job_id = jobs.id AND status = '{s}')"
+        for s in _CHUNK_STATUSES
+    ))
+    logger.info("Backfilled chunk status counters on existing jobs: %s", ', '.join(missing))
+
+@_serialized_write
 def create_job(conn, job_name, input_file, output_dir, engine, lang, voice, speed, device, merge_output,
                cb_audio_prompt=None, cb_voice_cloning=False, cb_temperature=None,
                cb_top_p=None, cb_repetition_penalty=None,
-               max_cpu_cores=None, max_torch_threads=4, max_gpu_memory=0.75, low_priority=True):
+               max_cpu_cores=None, max_torch_threads=4, max_gpu_memory=0.75, low_priority=True,
+               dtype='fp32', warmup=False, cache_dir=None):
     """Creates a new job record in the 'jobs' table.
 
     If a job with the same `job_name` already exists, it does not create a
@@ -104,6 +318,9 @@ def create_job(conn, job_name, input_file, output_dir, engine, lang, voice, spee
         cb_temperature: Temperature for Chatterbox.
         cb_top_p: Top-p sampling for Chatterbox.
         cb_repetition_penalty: Repetition penalty for Chatterbox.
+        dtype: Inference precision ('fp32', 'fp16', 'bf16', 'auto' or 'int8').
+        warmup: Whether workers run a throwaway synthesis before the first chunk.
+        cache_dir: Directory of the synthesis cache, or None to disable it.
 
     Returns:
         The integer ID of the newly created or existing job, or None on error.
@@ -111,23 +328,25 @@ def create_job(conn, job_name, input_file, output_dir, engine, lang, voice, spee
     sql = ''' INSERT INTO jobs(job_name, input_file, output_dir, engine, lang, voice, speed, device, merge_output,
                                cb_audio_prompt, cb_voice_cloning, cb_temperature,
                                cb_top_p, cb_repetition_penalty,
-                               max_cpu_cores, max_torch_threads, max_gpu_memory, low_priority)
-              VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?) '''
+                               max_cpu_cores, max_torch_threads, max_gpu_memory, low_priority, dtype, warmup, cache_dir)
+              VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+              ON CONFLICT(job_name) DO NOTHING
+              RETURNING id '''
     try:
         params = (job_name, input_file, output_dir, engine, lang, voice, speed, device, merge_output,
                   cb_audio_prompt, cb_voice_cloning, cb_temperature,
                   cb_top_p, cb_repetition_penalty,
-                  max_cpu_cores, max_torch_threads, max_gpu_memory, low_priority)
-        cursor = conn.cursor()
-        cursor.execute(sql, params)
-        conn.commit()
-        return cursor.lastrowid
-    except sqlite3.IntegrityError:
-        logger.warning(f"Job with name '{job_name}' already exists. Returning existing job ID.")
+                  max_cpu_cores, max_torch_threads, max_gpu_memory, low_priority, dtype, warmup, cache_dir)
+        with conn:
+            row = conn.execute(sql, params).fetchone()
+        if row:
+            return row[0]
+        # No row returned: the name already exists (no exception round-trip needed)
+        logger.warning("Job with name '%s' already exists. Returning existing job ID.", job_name)
         job = get_job_by_name(conn, job_name)
         return job['id'] if job else None
     except sqlite3.Error as e:
-        logger.error(f"Error creating job: {e}")
+        logger.error("Error creating job: %s", e)
         return None
 
 def get_job_by_name(conn, job_name):
@@ -138,53 +357,67 @@ def get_job_by_name(conn, job_name):
         job_name: The name of the job to retrieve.
 
     Returns:
-        A dictionary representing the job record, or None if not found or on error.
+        A sqlite3.Row representing the job record (accessed by column name),
+        or None if not found or on error.
     """
     try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM jobs WHERE job_name = ?", (job_name,))
-        job = cursor.fetchone()
-        return dict(job) if job else None
+        return conn.execute("SELECT * FROM jobs WHERE job_name = ?", (job_name,)).fetchone()
     except sqlite3.Error as e:
-        logger.error(f"Error getting job by name: {e}")
+        logger.error("Error getting job by name: %s", e)
         return None
 
-def create_chunks(conn, job_id, text_chunks):
+@_serialized_write
+def create_chunks(conn, job_id, text_chunks, voices=None, start_index=0):
     """Creates multiple chunk records for a given job in a single transaction.
 
     Empty or whitespace-only chunks in the input list are automatically skipped.
+    Requires SQLite's JSON functions (built in since SQLite 3.38). A job's
+    chunks may be created in several batches, as they are produced, by
+    passing the number of chunks created so far as `start_index`.
 
     Args:
         conn: An active sqlite3.Connection object.
         job_id: The ID of the parent job.
         text_chunks: A list of strings, where each string is the text for a chunk.
+        voices: An optional list, parallel to `text_chunks`, of voices that
+            override the job's voice for individual chunks (None entries use
+            the job's voice).
+        start_index: The chunk_index of the first chunk created.
+
+    Returns:
+        The number of chunks created.
     """
-    sql = ''' INSERT INTO chunks(job_id, chunk_index, text)
-              VALUES(?,?,?) '''
+    # The array position from json_each gives the contiguous chunk_index
+    sql = ''' INSERT INTO chunks(job_id, chunk_index, text, voice)
+              SELECT ?, ? + key, json_extract(value, '$[0]'), json_extract(value, '$[1]') FROM json_each(?) '''
     try:
         if not text_chunks:
-            logger.warning(f"No chunks supplied for job ID {job_id}; nothing to insert.")
-            return
+            logger.warning("No chunks supplied for job ID %s; nothing to insert.", job_id)
+            return 0
 
-        # Filter out empty / whitespace-only chunks proactively
-        filtered = [c.strip() for c in text_chunks if c and c.strip()]
+        # Filter out empty / whitespace-only chunks proactively (one strip per chunk)
+        if voices is None:
+            voices = [None] * len(text_chunks)
+        filtered = [(s, v) for c, v in zip(text_chunks, voices) if c and (s := c.strip())]
         skipped = len(text_chunks) - len(filtered)
         if skipped:
-            logger.info(f"Skipped {skipped} empty/blank chunk(s) for job ID {job_id}.")
+            logger.info("Skipped %s empty/blank chunk(s) for job ID %s.", skipped, job_id)
 
         if not filtered:
-            logger.warning(f"All provided chunks were empty for job ID {job_id}; nothing inserted.")
-            return
-
-        cursor = conn.cursor()
-        # Ensure contiguous chunk_index (0..n-1) after filtering
-        chunk_data = [(job_id, i, chunk) for i, chunk in enumerate(filtered)]
-        cursor.executemany(sql, chunk_data)
-        conn.commit()
-        logger.info(f"Successfully created {len(filtered)} chunks for job ID {job_id} (skipped {skipped}).")
+            logger.warning("All provided chunks were empty for job ID %s; nothing inserted.", job_id)
+            return 0
+
+        # One explicit write transaction (a single commit) for all rows. The
+        # chunks are bound as a single JSON array of [text, voice] pairs and
+        # expanded by SQLite's json_each, instead of binding parameters row by row.
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(sql, (job_id, start_index, json.dumps(filtered)))
+        logger.info("Successfully created %s chunks for job ID %s (skipped %s).", len(filtered), job_id, skipped)
+        return len(filtered)
     except sqlite3.Error as e:
-        logger.error(f"Error creating chunks: {e}")
+        logger.error("Error creating chunks: %s", e)
+        return 0
 
 def get_pending_chunk(conn, job_id):
     """Retrieves the next available chunk with 'pending' status for a job.
@@ -194,57 +427,44 @@ def get_pending_chunk(conn, job_id):
         job_id: The ID of the job to fetch a chunk from.
 
     Returns:
-        A dictionary representing the chunk record, or None if no pending chunks
+        A sqlite3.Row representing the chunk record, or None if no pending chunks
         are found or an error occurs.
     """
-    sql = "SELECT * FROM chunks WHERE job_id = ? AND status = 'pending' ORDER BY chunk_index ASC LIMIT 1"
     try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute(sql, (job_id,))
-        chunk = cursor.fetchone()
-        return dict(chunk) if chunk else None
+        return conn.execute(_SQL_PENDING_CHUNK, (job_id,)).fetchone()
     except sqlite3.Error as e:
-        logger.error(f"Error fetching pending chunk: {e}")
+        logger.error("Error fetching pending chunk: %s", e)
         return None
 
+@_serialized_write
 def claim_chunk(conn, job_id):
     """Atomically retrieves a pending chunk and updates its status to 'processing'.
 
     This function ensures that in a multi-worker setup, a single chunk is
-    claimed by only one worker.
+    claimed by only one worker. The lookup and the status change happen in a
+    single `UPDATE ... RETURNING` statement (requires SQLite 3.35+).
 
     Args:
         conn: An active sqlite3.Connection object.
         job_id: The ID of the job from which to claim a chunk.
 
     Returns:
-        A dictionary representing the claimed chunk, or None if no pending
+        A sqlite3.Row representing the claimed chunk, or None if no pending
         chunks are available or an error occurs.
     """
-    with conn: # Using 'with conn' ensures the transaction is handled correctly
-        try:
-            cursor = conn.cursor()
-            # Find a pending chunk
-            cursor.execute("SELECT id FROM chunks WHERE job_id = ? AND status = 'pending' ORDER BY chunk_index ASC LIMIT 1", (job_id,))
-            chunk_id_row = cursor.fetchone()
-
-            if chunk_id_row:
-                chunk_id = chunk_id_row[0]
-                # Update its status to 'processing'
-                cursor.execute("UPDATE chunks SET status = 'processing' WHERE id = ?", (chunk_id,))
-
-                # Retrieve the full chunk data
-                conn.row_factory = sqlite3.Row
-                cursor.execute("SELECT * FROM chunks WHERE id = ?", (chunk_id,))
-                chunk_row = cursor.fetchone()
-                return dict(chunk_row) if chunk_row else None
-            else:
-                return None # No pending chunks left
-        except sqlite3.Error as e:
-            logger.error(f"Error claiming chunk: {e}")
-            return None
+    try:
+        with conn: # Using 'with conn' ensures the transaction is handled correctly
+            # Take the write lock up front so racing workers wait on busy_timeout
+            # instead of failing a read-to-write lock upgrade
+            conn.execute("BEGIN IMMEDIATE")
+            # Select, mark and return the next pending chunk in one statement;
+            # None if no pending chunks left
+            return conn.execute(_SQL_CLAIM_CHUNK, (job_id,)).fetchone()
+    except sqlite3.Error as e:
+        logger.error("Error claiming chunk: %s", e)
+        return None
 
+@_serialized_write
 def update_chunk_status(conn, chunk_id, status, audio_file_path=None):
     """Updates the status and audio file path of a specific chunk.
 
@@ -254,14 +474,37 @@ def update_chunk_status(conn, chunk_id, status, audio_file_path=None):
         status: The new status string (e.g., 'completed', 'failed').
         audio_file_path: The path to the generated audio file. Defaults to None.
     """
-    sql = "UPDATE chunks SET status = ?, audio_file_path = ? WHERE id = ?"
     try:
-        cursor = conn.cursor()
-        cursor.execute(sql, (status, audio_file_path, chunk_id))
-        conn.commit()
+        with conn:
+            conn.execute(_SQL_UPDATE_CHUNK, (status, audio_file_path, chunk_id))
+    except sqlite3.Error as e:
+        logger.error("Error updating chunk status: %s", e)
+
+@_serialized_write
+def flush_chunk_updates(conn, updates):
+    """Applies a batch of chunk status updates in a single transaction.
+
+    Workers buffer their per-chunk results and flush them here, so a run of
+    completed chunks costs one commit instead of one commit per chunk.
+
+    Args:
+        conn: An active sqlite3.Connection object.
+        updates: A list of `(status, audio_file_path, chunk_id)` tuples.
+
+    Returns:
+        True if the batch was written (or was empty), False on error.
+    """
+    if not updates:
+        return True
+    try:
+        with conn:
+            conn.executemany(_SQL_UPDATE_CHUNK, updates)
+        return True
     except sqlite3.Error as e:
-        logger.error(f"Error updating chunk status: {e}")
+        logger.error("Error flushing %s chunk status update(s): %s", len(updates), e)
+        return False
 
+@_serialized_write
 def update_job_status(conn, job_id, status):
     """Updates the status of a specific job.
 
@@ -270,55 +513,91 @@ def update_job_status(conn, job_id, status):
         job_id: The ID of the job to update.
         status: The new status string (e.g., 'processing', 'completed').
     """
-    sql = "UPDATE jobs SET status = ? WHERE id = ?"
     try:
-        cursor = conn.cursor()
-        cursor.execute(sql, (status, job_id))
-        conn.commit()
+        with conn:
+            conn.execute(_SQL_UPDATE_JOB, (status, job_id))
     except sqlite3.Error as e:
-        logger.error(f"Error updating job status: {e}")
+        logger.error("Error updating job status: %s", e)
 
-def get_chunks_for_job(conn, job_id):
-    """Retrieves all chunks associated with a given job, ordered by index.
+def get_job_status(conn, job_id):
+    """Retrieves the current status string of a job.
 
     Args:
         conn: An active sqlite3.Connection object.
         job_id: The ID of the job.
 
     Returns:
-        A list of dictionaries, where each dictionary represents a chunk.
-        Returns an empty list on error.
+        The job's status (e.g., 'preparing', 'processing'), or None if the
+        job does not exist or on error.
     """
     try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM chunks WHERE job_id = ? ORDER BY chunk_index ASC", (job_id,))
-        chunks = cursor.fetchall()
-        return [dict(chunk) for chunk in chunks]
+        row = conn.execute(_SQL_JOB_STATUS, (job_id,)).fetchone()
+        return row[0] if row else None
     except sqlite3.Error as e:
-        logger.error(f"Error getting chunks for job: {e}")
-        return []
+        logger.error("Error getting job status: %s", e)
+        return None
+
+def get_chunk_status(conn, job_id, chunk_index):
+    """Retrieves the status of one chunk of a job by its position.
+
+    Args:
+        conn: An active sqlite3.Connection object.
+        job_id: The ID of the job.
+        chunk_index: The chunk's position within the job.
+
+    Returns:
+        The chunk's status string, or None if there is no such chunk or on error.
+    """
+    try:
+        row = conn.execute(_SQL_CHUNK_STATUS, (job_id, chunk_index)).fetchone()
+        return row[0] if row else None
+    except sqlite3.Error as e:
+        logger.error("Error getting chunk status: %s", e)
+        return None
+
+def get_chunks_for_job(conn, job_id):
+    """Iterates over all chunks associated with a given job, ordered by index.
+
+    Rows are read from the cursor one at a time, so large jobs are never
+    materialized as a full list.
+
+    Args:
+        conn: An active sqlite3.Connection object.
+        job_id: The ID of the job.
+
+    Yields:
+        A sqlite3.Row for each chunk. Stops early (after logging) on error.
+    """
+    try:
+        cursor = conn.execute("SELECT * FROM chunks WHERE job_id = ? ORDER BY chunk_index ASC", (job_id,))
+        yield from cursor
+    except sqlite3.Error as e:
+        logger.error("Error getting chunks for job: %s", e)
 
 def get_job_stats(conn, job_id):
-    """Calculates statistics for a given job based on its chunk statuses.
+    """Returns statistics for a given job based on its chunk statuses.
+
+    The counts come from the job's counter columns, which the chunk triggers
+    keep up to date, so this is a single-row lookup regardless of job size.
 
     Args:
         conn: An active sqlite3.Connection object.
         job_id: The ID of the job.
 
     Returns:
-        A dictionary with counts for each status (e.g., 'completed', 'pending')
-        and a 'total' count. Returns an empty dictionary on error.
+        A dictionary with counts for each status present (e.g., 'completed',
+        'pending') and a 'total' count. Returns an empty dictionary on error
+        or if the job does not exist.
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT status, COUNT(*) FROM chunks WHERE job_id = ? GROUP BY status", (job_id,))
-        stats = dict(cursor.fetchall())
-        total_chunks = sum(stats.values())
-        stats['total'] = total_chunks
+        row = conn.execute(_SQL_JOB_STATS, (job_id,)).fetchone()
+        if row is None:
+            return {}
+        stats = {status: row[f"{status}_count"] for status in _CHUNK_STATUSES if row[f"{status}_count"]}
+        stats['total'] = row['total_count']
         return stats
     except sqlite3.Error as e:
-        logger.error(f"Error getting job stats: {e}")
+        logger.error("Error getting job stats: %s", e)
         return {}
 
 def get_all_jobs(conn):
@@ -328,19 +607,17 @@ def get_all_jobs(conn):
         conn: An active sqlite3.Connection object.
 
     Returns:
-        A list of dictionaries, each representing a job summary, ordered by
-        creation date descending. Returns an empty list on error.
+        A list of `JobSummary` named tuples (id, job_name, status, created_at),
+        ordered by creation date descending. Returns an empty list on error.
     """
     try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, job_name, status, created_at FROM jobs ORDER BY created_at DESC")
-        jobs = cursor.fetchall()
-        return [dict(job) for job in jobs]
+        cursor = conn.execute("SELECT id, job_name, status, created_at FROM jobs ORDER BY created_at DESC")
+        return [JobSummary(*job) for job in cursor.fetchall()]
     except sqlite3.Error as e:
-        logger.error(f"Error getting all jobs: {e}")
+        logger.error("Error getting all jobs: %s", e)
         return []
 
+@_serialized_write
 def reset_failed_chunks(conn, job_id):
     """Resets chunks with 'failed' or 'processing' status back to 'pending'.
 
@@ -355,16 +632,19 @@ def reset_failed_chunks(conn, job_id):
     Returns:
         The number of chunks that were updated.
     """
-    sql = "UPDATE chunks SET status = 'pending', retries = retries + 1 WHERE job_id = ? AND status IN ('failed', 'processing')"
     try:
-        cursor = conn.cursor()
-        cursor.execute(sql, (job_id,))
-        updated_count = cursor.rowcount
-        conn.commit()
-        logger.info(f"Reset {updated_count} failed/stuck chunks to 'pending' for job ID {job_id}.")
+        # The job's status counters tell us up front whether anything needs
+        # resetting; skip the write transaction entirely on a clean job.
+        row = conn.execute(_SQL_RESETTABLE_COUNT, (job_id,)).fetchone()
+        if not row or not row[0]:
+            logger.info("No failed/stuck chunks to reset for job ID %s.", job_id)
+            return 0
+        with conn:
+            updated_count = conn.execute(_SQL_RESET_CHUNKS, (job_id,)).rowcount
+        logger.info("Reset %s failed/stuck chunks to 'pending' for job ID %s.", updated_count, job_id)
         return updated_count
     except sqlite3.Error as e:
-        logger.error(f"Error resetting failed chunks: {e}")
+        logger.error("Error resetting failed chunks: %s", e)
         return 0
 
 if __name__ == '__main__':
@@ -388,4 +668,4 @@ if __name__ == '__main__':
             stats = get_job_stats(db_conn, job_id)
             print(f"Job stats: {stats}")
 
-        db_conn.close()
+        close_connection(db_conn)
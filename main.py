@@ -1,47 +1,59 @@
 import argparse
+import itertools
 import logging
 import os
 import sys
-import glob
 from datetime import datetime
 from pathlib import Path
+import threading
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
-import natsort
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 import database as db
 from utils.logger import setup_logging
-from utils.pdf_parser import extract_text_from_pdf
-from utils.file_handler import ensure_dir_exists
-from utils.text_file_parser import extract_text_from_txt
-from utils.conversation_parser import extract_conversation_from_text
-from utils.split_text import split_text_into_chunks
-from utils.audio_merger import merge_audio_files
-from worker import process_chunk_worker
-
-# Adjust path to import from sibling directories
+from utils.file_handler import ensure_dir_exists, index_segment_files
+from utils.text_file_parser import extract_text_from_txt, iter_text_file
+from utils.conversation_parser import DEFAULT_SPEAKER_VOICE, SPEAKER_VOICES, coalesce_speaker_turns, iter_conversation_parts
+from utils.split_text import balance_chunks, iter_text_chunks, smart_split_text
+from utils.synthesis_cache import DEFAULT_CACHE_DIR, SynthesisCache
+from utils.resource_limiter import cap_workers_for_device, get_cpu_count
+from worker import WORKER_MP_CONTEXT, configure_inference, create_tts_processor, process_chunk_worker, synthesize_segment, warm_up_processor
+
 # Adjust path to ensure the app's root directory is on sys.path
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_DIR = str(Path(__file__).resolve().parent)
 if SCRIPT_DIR not in sys.path:
     sys.path.insert(0, SCRIPT_DIR)
 
 # --- Logging Setup ---
-setup_logging(main_process=True)
+# Configured by the entry point below, not at import: spawned worker processes
+# re-import this module and must not open the log file too.
 logger = logging.getLogger(__name__)
 # ---
 
+# Documents are split into at least this many chunks per worker, so the last
+# chunks to finish are small and no worker sits idle while another finishes.
+MIN_CHUNKS_PER_WORKER = 4
+
+# Seconds the streaming merger waits before re-checking a chunk that is not done yet
+MERGE_POLL_INTERVAL = 0.5
+
+# Without --num-workers, one worker per CPU core is started, up to this many.
+# Each worker holds its own model, so more rarely pays off on one machine.
+DEFAULT_MAX_WORKERS = 4
+
 def main():
     """The main command-line interface for the TTS application.
 
     This function orchestrates the entire process based on command-line
     arguments. It can operate in one of three main modes:
     1.  **Create and Process:** If an input source (like --pdf or --text) is
-        provided, it creates a new job in the database, splits the input text
-        into chunks, and starts a pool of worker processes to convert the
-        chunks to audio.
+        provided, it creates a new job in the database and starts a pool of
+        worker processes to convert the chunks to audio. The input text is
+        parsed and split into chunks while the workers load their TTS engine.
     2.  **Resume:** If the --resume flag is used with a --job-name, it resets
         any failed or stuck chunks for that job and starts the worker pool to
-        continue processing.
+        continue processing. A job interrupted before all of its chunks were
+        created cannot be resumed.
     3.  **Monitor:** If the --monitor flag is used with a --job-name, it
         displays a live progress bar for the specified job without starting
         any processing.
@@ -58,13 +70,15 @@ def main():
     parser.add_argument("--job-name", type=str, help="Unique name for the conversion job. If not provided, one will be generated.")
     parser.add_argument("--resume", action="store_true", help="Resume a failed or interrupted job by its --job-name.")
     parser.add_argument("--monitor", action="store_true", help="Monitor the progress of a job by its --job-name.")
-    parser.add_argument("--num-workers", type=int, default=2, help="Number of worker processes to use.")
+    parser.add_argument("--serve", action="store_true", help="Keep one TTS engine loaded and convert each line read from stdin, printing the audio file paths.")
+    parser.add_argument("--num-workers", type=int, default=None,
+                        help=f"Number of worker processes to use. Default: one per CPU core, up to {DEFAULT_MAX_WORKERS}.")
 
     # --- Input source group (optional if resuming or monitoring) ---
     input_group = parser.add_mutually_exclusive_group()
-    input_group.add_argument("--text", type=str, help="Direct text to convert.")
-    input_group.add_argument("--pdf", type=str, help="Path to a PDF file.")
-    input_group.add_argument("--text_file", type=str, help="Path to a text file.")
+    input_group.add_argument("--text", type=str, nargs='+', help="Direct text to convert. Several texts are processed as one job.")
+    input_group.add_argument("--pdf", type=str, nargs='+', help="Path to one or more PDF files, processed as one job.")
+    input_group.add_argument("--text_file", type=str, nargs='+', help="Path to one or more text files, processed as one job.")
     input_group.add_argument("--conversation", type=str, help="Path to a conversation file.")
 
     # --- Standard TTS and output arguments ---
@@ -74,6 +88,12 @@ def main():
     parser.add_argument("--voice", type=str, default="af_heart", help="Voice model for Kokoro.")
     parser.add_argument("--speed", type=float, default=1.0, help="Speech speed.")
     parser.add_argument("--device", type=str, default=None, choices=["cpu", "cuda", "mps"], help="Device to use for TTS.")
+    parser.add_argument("--dtype", type=str, default="fp32", choices=["fp32", "fp16", "bf16", "auto", "int8"],
+                        help="Inference precision. fp16/bf16/auto apply on CUDA ('auto' picks bf16 on compute capability 8.0+ and fp16 otherwise); "
+                             "int8 quantizes the Kokoro model on CPU. Default: fp32.")
+    parser.add_argument("--cache-dir", type=str, nargs="?", const=DEFAULT_CACHE_DIR, default=None,
+                        help=f"Reuse audio for segments already synthesized with the same options. Without a path, uses {DEFAULT_CACHE_DIR}.")
+    parser.add_argument("--warmup", action="store_true", help="Run a short throwaway synthesis after loading the engine so the first real chunk runs at full speed.")
     parser.add_argument("--merge_output", action="store_true", help="Merge final audio segments.")
     parser.add_argument("--paragraphs_per_chunk", type=int, default=10, help="Number of paragraphs per processing chunk.")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable debug logging.")
@@ -97,10 +117,16 @@ def main():
 
     args = parser.parse_args()
 
-    if args.verbose:
-        setup_logging(level=logging.DEBUG, main_process=True)
+    if args.verbose and not logging.getLogger().isEnabledFor(logging.DEBUG):
+        # The handlers set up at import have no level of their own, so lowering
+        # the root level is enough; no need to rebuild them (and the log file).
+        logging.getLogger().setLevel(logging.DEBUG)
         logger.info("Verbose logging enabled.")
 
+    if args.serve:
+        serve_stdin(args)
+        return
+
     db_conn = db.create_connection()
     if not db_conn:
         return
@@ -111,30 +137,35 @@ def main():
         if not args.job_name:
             logger.error("--job-name is required for monitoring.")
             return
-        monitor_job(db_conn, args.job_name)
-        db_conn.close()
+        # Poll through this thread's read-only connection so monitoring never
+        # contends with the workers' writes.
+        monitor_job(db.get_reader_connection() or db_conn, args.job_name)
+        db.close_connection(db_conn)
         return
 
     job_to_process = None
     if args.resume:
         if not args.job_name:
             logger.error("--job-name is required for resuming.")
-            db_conn.close()
+            db.close_connection(db_conn)
             return
-        job = db.get_job_by_name(db_conn, args.job_name)
-        if not job:
-            logger.error(f"No job found with name: {args.job_name}")
-            db_conn.close()
+        job_to_process = resume_job(db_conn, args.job_name)
+        if not job_to_process:
+            db.close_connection(db_conn)
             return
-        db.reset_failed_chunks(db_conn, job['id'])
-        logger.info(f"Job '{args.job_name}' is ready to be resumed.")
-        job_to_process = args.job_name
 
     # --- Job Creation (if input is provided) ---
-    input_source = args.text or args.pdf or args.text_file or args.conversation
+    input_sources = args.text or args.pdf or args.text_file or ([args.conversation] if args.conversation else [])
+    input_source = input_sources[0] if input_sources else None
     if not input_source and not args.resume:
         parser.error("An input source (--text, --pdf, etc.) is required to start a new job, or use --resume or --monitor with --job-name.")
 
+    if input_source and not args.text:
+        # Catch missing inputs before a job is created for them
+        for path in input_sources:
+            if not os.path.isfile(path) or not os.access(path, os.R_OK):
+                parser.error(f"Cannot read input file: {path}")
+
     if input_source:
         job_name = args.job_name
         if not job_name:
@@ -144,22 +175,11 @@ def main():
                 base_name = "direct_text"
             job_name = f"{base_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
-        logger.info(f"Creating new job: {job_name}")
-
-        text_to_process = ""
-        if args.text: text_to_process = args.text
-        elif args.pdf: text_to_process = extract_text_from_pdf(args.pdf)
-        elif args.text_file: text_to_process = extract_text_from_txt(args.text_file)
-        elif args.conversation: text_to_process = extract_text_from_txt(args.conversation)
-
-        if not text_to_process or not text_to_process.strip():
-            logger.error("Input source is empty or could not be read. Exiting.")
-            db_conn.close()
-            return
+        logger.info("Creating new job: %s", job_name)
 
         job_id = db.create_job(
             conn=db_conn, job_name=job_name,
-            input_file=input_source if not args.text else "direct_text",
+            input_file=", ".join(input_sources) if not args.text else "direct_text",
             output_dir=args.output_dir, engine=args.engine, lang=args.lang,
             voice=args.voice, speed=args.speed, device=args.device,
             merge_output=args.merge_output,
@@ -171,78 +191,365 @@ def main():
             max_cpu_cores=args.max_cpu_cores,
             max_torch_threads=args.max_torch_threads,
             max_gpu_memory=args.max_gpu_memory,
-            low_priority=args.low_priority
+            low_priority=args.low_priority,
+            dtype=args.dtype,
+            warmup=args.warmup,
+            cache_dir=args.cache_dir
         )
 
         if not job_id:
             logger.error("Failed to create job in the database. Exiting.")
-            db_conn.close()
+            db.close_connection(db_conn)
             return
 
-        text_chunks = split_text_into_chunks(text_to_process, args.paragraphs_per_chunk)
-        db.create_chunks(db_conn, job_id, text_chunks)
-
-        logger.info(f"Job '{job_name}' created with {len(text_chunks)} chunks. Starting processing...")
+        # The input is parsed only after the workers have been started (see
+        # below); until its chunks exist the job stays 'preparing'.
+        db.update_job_status(db_conn, job_id, 'preparing')
         job_to_process = job_name
 
     # --- Processing Logic ---
     if job_to_process:
-        num_workers = args.num_workers
+        job_data = db.get_job_by_name(db_conn, job_to_process)
+        job_id = job_data['id']
+        num_workers = args.num_workers or min(get_cpu_count(), DEFAULT_MAX_WORKERS)
         
         # For Chatterbox, limit to 1 worker to prevent system overload during model loading
         # The Chatterbox model is very large and loading it in multiple processes simultaneously
         # can overwhelm system memory and CPU
-        if args.engine == 'chatterbox' and num_workers > 1:
-            logger.warning(f"Chatterbox engine detected. Reducing workers from {num_workers} to 1 to prevent system overload.")
+        if job_data['engine'] == 'chatterbox' and num_workers > 1:
+            logger.warning("Chatterbox engine detected. Reducing workers from %s to 1 to prevent system overload.", num_workers)
             num_workers = 1
+        num_workers = cap_workers_for_device(num_workers, job_data['device'])
+        if num_workers > get_cpu_count():
+            logger.warning("Reducing workers from %s to the %s available CPU cores.", num_workers, get_cpu_count())
+            num_workers = get_cpu_count()
+        if not input_source:
+            # Each worker loads its own engine, so a resumed job with only a
+            # few chunks left does not start workers that would find no work.
+            pending = db.get_job_stats(db_conn, job_id).get('pending', 0)
+            if pending < num_workers:
+                logger.info("Only %s chunk(s) left to process; starting %s worker(s).", pending, pending)
+                num_workers = pending
         
-        logger.info(f"Starting ProcessPoolExecutor with {num_workers} workers for job '{job_to_process}'.")
-        db.update_job_status(db_conn, db.get_job_by_name(db_conn, job_to_process)['id'], 'processing')
-
-        with ProcessPoolExecutor(max_workers=num_workers) as executor:
-            futures = [executor.submit(process_chunk_worker, job_to_process) for _ in range(num_workers)]
+        logger.info("Starting ProcessPoolExecutor with %s workers for job '%s'.", num_workers, job_to_process)
+        if not input_source:
+            db.update_job_status(db_conn, job_id, 'processing')
+
+        merged_output_path = os.path.join(job_data['output_dir'], f"{job_to_process}_merged.wav")
+        workers_done = threading.Event()
+        job_prepared = True
+        # Segments are merged in order while later chunks are still being
+        # synthesized, so the merge adds next to nothing to the run time.
+        with ThreadPoolExecutor(max_workers=1) as merger, \
+                ProcessPoolExecutor(max_workers=max(num_workers, 1), mp_context=WORKER_MP_CONTEXT) as executor:
+            futures = [executor.submit(process_chunk_worker, job_to_process, slot, num_workers) for slot in range(num_workers)]
+            merge_future = None
+            if job_data['merge_output']:
+                merge_future = merger.submit(
+                    merge_chunks_in_order, job_id, job_to_process, job_data['output_dir'], merged_output_path, workers_done
+                )
+
+            if input_source:
+                # The workers load their TTS engine while the input is parsed here
+                job_prepared = prepare_job_chunks(db_conn, job_id, job_to_process, args, num_workers)
 
             total_processed = 0
-            for future in as_completed(futures):
-                total_processed += future.result()
+            try:
+                for future in as_completed(futures):
+                    total_processed += future.result()
+            finally:
+                workers_done.set()
+        streamed_merge = merge_future is not None and merge_future.result()
+
+        if not job_prepared:
+            db.close_connection(db_conn)
+            return
 
-        logger.info(f"All workers have finished. Total chunks processed in this run: {total_processed}.")
+        logger.info("All workers have finished. Total chunks processed in this run: %s.", total_processed)
 
         # --- Finalization and Merging ---
-        job_id = db.get_job_by_name(db_conn, job_to_process)['id']
         stats = db.get_job_stats(db_conn, job_id)
 
         if stats.get('total') == stats.get('completed', 0):
-            logger.info(f"Job '{job_to_process}' completed successfully.")
+            logger.info("Job '%s' completed successfully.", job_to_process)
             db.update_job_status(db_conn, job_id, 'completed')
 
-            job_data = db.get_job_by_name(db_conn, job_to_process)
-            if job_data and job_data['merge_output']:
+            if streamed_merge:
+                logger.info("Merged audio written to %s", merged_output_path)
+            elif job_data['merge_output']:
                 logger.info("Merging audio files...")
-                # Collect ALL segment files generated for this job across all chunks.
-                # Each chunk may produce multiple segment WAV files with pattern: {job_name}_chunk_XXXX_segment_YYY.wav
-                pattern = os.path.join(job_data['output_dir'], f"{job_to_process}_chunk_*_segment_*.wav")
-                segment_files = glob.glob(pattern)
-                if not segment_files:
-                    logger.warning("No segment audio files found for merging (pattern: %s).", pattern)
+                # Collect ALL segment files generated for this job across all chunks,
+                # already in chunk and segment order.
+                segments = index_segment_files(job_data['output_dir'], job_to_process)
+                sorted_files = [path for chunk_files in segments.values() for path in chunk_files]
+                if not sorted_files:
+                    logger.warning("No segment audio files found for merging in %s.", job_data['output_dir'])
                 else:
-                    # Natural sort to ensure correct chronological ordering
-                    sorted_files = natsort.natsorted(segment_files)
-                    print(sorted_files)
-                    merged_filename = f"{job_to_process}_merged.wav"
-                    merged_output_path = os.path.join(job_data['output_dir'], merged_filename)
-                    logger.info(f"Merging {len(sorted_files)} segment files into {merged_output_path}")
-                    success = merge_audio_files(sorted_files, merged_output_path)
+                    # Imported here so runs that never merge skip loading pydub
+                    from utils.audio_merger import merge_audio_files, merge_wav_files
+
+                    logger.info("Merging %s segment files into %s", len(sorted_files), merged_output_path)
+                    # Copy the PCM directly; decode and convert only if the formats differ
+                    success = merge_wav_files(sorted_files, merged_output_path) or merge_audio_files(sorted_files, merged_output_path)
                     if success:
-                        logger.info(f"Successfully merged {len(sorted_files)} segments into {merged_output_path}")
+                        logger.info("Successfully merged %s segments into %s", len(sorted_files), merged_output_path)
                     else:
                         logger.error("Failed to merge audio files (see previous errors).")
 
         else:
-            logger.warning(f"Job '{job_to_process}' finished with incomplete or failed chunks.")
+            logger.warning("Job '%s' finished with incomplete or failed chunks.", job_to_process)
             db.update_job_status(db_conn, job_id, 'failed')
 
-    db_conn.close()
+    db.close_connection(db_conn)
+
+
+def resume_job(conn, job_name):
+    """Prepares an existing job to be processed again.
+
+    Failed or stuck chunks are reset to 'pending'. A job that was interrupted
+    while still 'preparing' only has part of its chunks, so it cannot be
+    resumed and must be started again.
+
+    Args:
+        conn: An active sqlite3.Connection object.
+        job_name: The name of the job to resume.
+
+    Returns:
+        The job's name if it can be resumed, otherwise None.
+    """
+    job = db.get_job_by_name(conn, job_name)
+    if not job:
+        logger.error("No job found with name: %s", job_name)
+        return None
+    if job['status'] == 'preparing':
+        logger.error("Job '%s' was interrupted while its input was being split into chunks, "
+                     "so some of its text is missing. Start it again as a new job instead.", job_name)
+        return None
+    db.reset_failed_chunks(conn, job['id'])
+    logger.info("Job '%s' is ready to be resumed.", job_name)
+    return job_name
+
+
+def merge_chunks_in_order(job_id, job_name, output_dir, merged_path, workers_done):
+    """Merges a job's segment files in chunk order while the job is still running.
+
+    Runs in a background thread next to the worker pool. Each chunk is
+    appended to the merged file as soon as it and every chunk before it have
+    been completed, so merging overlaps synthesis instead of following it.
+
+    Args:
+        job_id: The ID of the job being processed.
+        job_name: The name of the job, used to find its segment files.
+        output_dir: The directory holding the segment files.
+        merged_path: The path of the merged WAV file to write.
+        workers_done: A threading.Event set once all workers have exited.
+
+    Returns:
+        True if every chunk of the job was merged, False if a chunk failed,
+        the job ended incomplete or a segment could not be appended (the
+        caller then merges the segment files once the run is over).
+    """
+    conn = db.get_reader_connection()
+    chunk_index = 0
+    merged = False
+    try:
+        # Imported here so runs that never merge skip loading pydub
+        from utils.audio_merger import WavAppender
+
+        with WavAppender(merged_path) as appender:
+            while True:
+                # Checked before the chunk status so a chunk completed just
+                # before the workers exited is never missed.
+                done = workers_done.is_set()
+                status = db.get_chunk_status(conn, job_id, chunk_index)
+                if status == 'completed':
+                    # Scanned afresh for every chunk: an earlier scan may have
+                    # caught this chunk while only part of it was written.
+                    for segment_file in index_segment_files(output_dir, job_name).get(chunk_index, []):
+                        appender.append(segment_file)
+                    chunk_index += 1
+                elif status == 'failed' or done:
+                    merged = status is None and chunk_index > 0
+                    break
+                else:
+                    time.sleep(MERGE_POLL_INTERVAL)
+    except Exception as e:
+        logger.warning("Streaming merge stopped at chunk %s: %s", chunk_index, e)
+    finally:
+        db.close_reader_connections()
+        if not merged and os.path.exists(merged_path):
+            os.remove(merged_path)
+    return merged
+
+
+def prepare_job_chunks(conn, job_id, job_name, args, num_workers=1):
+    """Reads the job's inputs, splits them into chunks and releases them to workers.
+
+    This runs while the worker pool is already starting up. Plain-text input
+    is read and stored in batches, so workers start on the first chunks while
+    the rest of a large document is still being read. Once all chunks are
+    stored, the job moves from 'preparing' to 'processing', which tells idle
+    workers that no further chunks will arrive. If the input is empty, or
+    any input file cannot be read in full, the job is marked 'failed' so the
+    workers exit.
+
+    A conversation file becomes one chunk per speaker turn, each voiced with
+    its speaker's Kokoro voice, so the turns are synthesized in parallel by
+    the pool and merged back in order. Files without speaker cues are read
+    as plain text.
+
+    Args:
+        conn: An active sqlite3.Connection object.
+        job_id: The ID of the job being prepared.
+        job_name: The name of the job being prepared.
+        args: The parsed command-line arguments holding the input sources.
+            Multiple inputs are joined in order into a single text.
+        num_workers: The number of workers in the pool. Plain text is split
+            into at least `MIN_CHUNKS_PER_WORKER` chunks per worker.
+
+    Returns:
+        True if chunks were created and the job is ready, False otherwise.
+    """
+    try:
+        if args.conversation:
+            chunk_count = _create_conversation_chunks(conn, job_id, args, num_workers)
+        else:
+            chunk_count = _create_text_chunks(conn, job_id, iter_input_texts(args), args, num_workers)
+
+        if not chunk_count:
+            logger.error("Input source is empty or could not be read. Exiting.")
+            db.update_job_status(conn, job_id, 'failed')
+            return False
+    except ValueError as e:
+        logger.error("%s. Exiting.", e)
+        db.update_job_status(conn, job_id, 'failed')
+        return False
+    except BaseException:
+        # Never leave workers waiting on a job that will not get chunks
+        db.update_job_status(conn, job_id, 'failed')
+        raise
+
+    db.update_job_status(conn, job_id, 'processing')
+    logger.info("Job '%s' created with %s chunks. Processing...", job_name, chunk_count)
+    return True
+
+
+def iter_input_texts(args):
+    """Yields the text of the job's plain-text inputs piece by piece.
+
+    PDFs are read one page at a time and text files one block at a time, so
+    neither is ever held in memory as a whole. Multiple inputs are separated
+    by a paragraph break, so no paragraph spans two inputs.
+
+    Args:
+        args: The parsed command-line arguments holding the input sources.
+
+    Yields:
+        Consecutive pieces of the combined text.
+
+    Raises:
+        ValueError: If an input file cannot be read, fails part-way through,
+            or contains no text.
+    """
+    if args.pdf:
+        from utils.pdf_parser import iter_pdf_pages
+
+        for path in args.pdf:
+            pages = filter(None, iter_pdf_pages(path))  # Skip pages without text
+            for page_text in _iter_input_file(path, pages):
+                yield page_text
+                yield "\n"
+            yield "\n\n"
+    elif args.text_file:
+        for path in args.text_file:
+            yield from _iter_input_file(path, iter_text_file(path))
+            yield "\n\n"
+    else:
+        for text in args.text:
+            yield text
+            yield "\n\n"
+
+
+def _iter_input_file(path, pieces):
+    """Passes on the text read from one input file, checking that it is complete.
+
+    Args:
+        path: The input file being read.
+        pieces: An iterator over the file's text.
+
+    Yields:
+        The pieces of the file's text.
+
+    Raises:
+        ValueError: If reading the file fails or it yields no text.
+    """
+    has_text = False
+    try:
+        for piece in pieces:
+            has_text = has_text or not piece.isspace()
+            yield piece
+    except Exception as e:
+        raise ValueError(f"Could not read input file {path}: {e}") from e
+    if not has_text:
+        raise ValueError(f"Input file {path} contains no text")
+
+
+def _create_text_chunks(conn, job_id, text_pieces, args, num_workers):
+    """Splits streamed text into chunks and stores them in batches as they are produced.
+
+    The first batch is stored as soon as every worker can be given several
+    chunks, so synthesis starts while the rest of the input is still being
+    read. Inputs too short to fill that first batch are split more finely
+    instead (see `balance_chunks`).
+
+    Returns:
+        The number of chunks created.
+    """
+    batch_size = num_workers * MIN_CHUNKS_PER_WORKER
+    text_chunks = iter_text_chunks(text_pieces, args.paragraphs_per_chunk)
+    batch = list(itertools.islice(text_chunks, batch_size))
+    if len(batch) < batch_size:
+        batch = balance_chunks(batch, batch_size)
+
+    chunk_count = 0
+    while batch:
+        chunk_count += db.create_chunks(conn, job_id, batch, start_index=chunk_count)
+        batch = list(itertools.islice(text_chunks, batch_size))
+    return chunk_count
+
+
+def _create_conversation_chunks(conn, job_id, args, num_workers):
+    """Stores one chunk per speaker turn of a conversation file.
+
+    Each turn is voiced with its speaker's Kokoro voice, so the turns are
+    synthesized in parallel by the pool and merged back in order.
+    Consecutive cues by the same speaker form a single turn. Turns are
+    stored in batches as they are parsed, like `_create_text_chunks`, so the
+    workers start on the first turns while the rest are parsed. A file
+    without speaker cues is chunked as plain text.
+
+    Returns:
+        The number of chunks created.
+    """
+    text_to_process = extract_text_from_txt(args.conversation)
+    if not text_to_process or text_to_process.isspace():
+        return 0
+
+    batch_size = num_workers * MIN_CHUNKS_PER_WORKER
+    turns = coalesce_speaker_turns(iter_conversation_parts(text_to_process))
+    batch = list(itertools.islice(turns, batch_size))
+    if not batch:
+        return _create_text_chunks(conn, job_id, [text_to_process], args, num_workers)
+
+    chunk_count = 0
+    while batch:
+        texts = [text for _, text in batch]
+        # Speaker voices are Kokoro voices; Chatterbox speaks every turn
+        # with its own (optionally cloned) voice.
+        voices = [SPEAKER_VOICES.get(speaker, DEFAULT_SPEAKER_VOICE) for speaker, _ in batch] if args.engine == 'kokoro' else None
+        chunk_count += db.create_chunks(conn, job_id, texts, voices, start_index=chunk_count)
+        batch = list(itertools.islice(turns, batch_size))
+    return chunk_count
 
 
 def monitor_job(conn, job_name):
@@ -258,7 +565,7 @@ def monitor_job(conn, job_name):
     """
     job = db.get_job_by_name(conn, job_name)
     if not job:
-        logger.error(f"No job found with name: {job_name}")
+        logger.error("No job found with name: %s", job_name)
         return
 
     job_id = job['id']
@@ -296,5 +603,46 @@ def monitor_job(conn, job_name):
     except KeyboardInterrupt:
         print("\nMonitoring stopped.")
 
+def serve_stdin(args):
+    """Converts lines read from stdin to speech with a single warm TTS engine.
+
+    The engine is loaded once and reused for every line, so each request only
+    pays for synthesis instead of the torch import and model load. Each line
+    is split like a chunk's text, and the path of every audio file written to
+    `args.output_dir` is printed to stdout as soon as it exists. Runs until
+    stdin is closed.
+
+    Args:
+        args: The parsed command-line arguments holding the engine options.
+    """
+    settings = vars(args)
+    device, autocast_dtype = configure_inference(settings)
+    tts_processor = create_tts_processor(settings, device)
+    if tts_processor is None:
+        logger.error("Engine '%s' is not supported.", args.engine)
+        return
+    if args.warmup:
+        warm_up_processor(tts_processor, autocast_dtype)
+    cache = SynthesisCache(settings, args.cache_dir) if args.cache_dir else None
+
+    ensure_dir_exists(args.output_dir)
+    prefix = args.job_name or f"serve_{os.getpid()}"
+    segment_index = 0
+    logger.info("Serving '%s' on device '%s'; reading text from stdin.", args.engine, device)
+    try:
+        for line in sys.stdin:
+            for segment in smart_split_text(line):
+                audio_files = synthesize_segment(
+                    tts_processor, segment, args.output_dir, f"{prefix}_{segment_index:06d}", autocast_dtype, cache
+                )
+                segment_index += 1
+                for audio_file in audio_files:
+                    print(audio_file, flush=True)
+    except KeyboardInterrupt:
+        pass
+    logger.info("Served %s segments.", segment_index)
+
+
 if __name__ == "__main__":
+    setup_logging(main_process=True)
     main()
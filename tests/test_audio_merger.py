@@ -2,13 +2,14 @@ import unittest
 from unittest.mock import patch, MagicMock
 import os
 import shutil
+import wave
 from pydub import AudioSegment
 
 # We need to import the function from the module we are testing.
 # Since the module is in the parent directory, we need to adjust the path.
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils.audio_merger import merge_audio_files
+from utils.audio_merger import WavAppender, merge_audio_files, merge_wav_files
 
 class TestAudioMerger(unittest.TestCase):
 
@@ -66,5 +67,43 @@ class TestAudioMerger(unittest.TestCase):
         result = merge_audio_files(file_paths, self.output_file)
         self.assertFalse(result)
 
+    def test_merge_wav_files_copies_pcm_directly(self):
+        """Same-format WAVs are merged into a preallocated file of the combined length."""
+        self.assertTrue(merge_wav_files([self.audio_file1, self.audio_file2], self.output_file))
+        merged_audio = AudioSegment.from_wav(self.output_file)
+        self.assertAlmostEqual(len(merged_audio), 200, delta=10)
+        with wave.open(self.output_file, "rb") as merged, wave.open(self.audio_file1, "rb") as first:
+            self.assertEqual(merged.getnframes(), 2 * first.getnframes())
+
+    def test_wav_appender_concatenates_in_order(self):
+        """Files appended one by one form a single WAV of the combined length."""
+        with WavAppender(self.output_file) as appender:
+            appender.append(self.audio_file1)
+            appender.append(self.audio_file2)
+        self.assertEqual(appender.segment_count, 2)
+        with wave.open(self.output_file, "rb") as merged, wave.open(self.audio_file1, "rb") as first:
+            self.assertEqual(merged.getnframes(), 2 * first.getnframes())  # Header sizes filled in on close
+
+        merged_audio = AudioSegment.from_wav(self.output_file)
+        self.assertAlmostEqual(len(merged_audio), 200, delta=10)
+
+    def test_wav_appender_rejects_mismatched_format(self):
+        """A file with a different sample rate cannot be appended."""
+        other_rate = os.path.join(self.test_dir, "audio_8k.wav")
+        AudioSegment.silent(duration=100, frame_rate=8000).export(other_rate, format="wav")
+        with WavAppender(self.output_file) as appender:
+            appender.append(self.audio_file1)
+            with self.assertRaises(ValueError):
+                appender.append(other_rate)
+
+    def test_wav_appender_rejects_truncated_file(self):
+        """A file cut short of the size its header states cannot be appended."""
+        with open(self.audio_file2, "r+b") as f:
+            f.truncate(os.path.getsize(self.audio_file2) - 100)
+        with WavAppender(self.output_file) as appender:
+            appender.append(self.audio_file1)
+            with self.assertRaises(EOFError):
+                appender.append(self.audio_file2)
+
 if __name__ == '__main__':
     unittest.main()
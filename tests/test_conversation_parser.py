@@ -0,0 +1,33 @@
+import unittest
+import os
+import types
+
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.conversation_parser import coalesce_speaker_turns, extract_conversation_from_text, iter_conversation_parts
+
+
+class TestConversationParser(unittest.TestCase):
+
+    def test_turns_are_streamed_in_order(self):
+        """Speaker turns are yielded lazily, joining continuation lines."""
+        text = "Title line\r\nMan: Hello\r\nthere.\rWoman:\nWoman: Hi!\n\nman: Bye."
+        parts = iter_conversation_parts(text)
+        self.assertIsInstance(parts, types.GeneratorType)
+        self.assertEqual(list(parts), [("Man", "Hello there."), ("Woman", "Hi!"), ("Man", "Bye.")])
+
+    def test_consecutive_turns_by_one_speaker_are_merged(self):
+        """Back-to-back cues of the same speaker become a single turn."""
+        text = "Man: One.\nMan: Two.\nWoman: Three.\nMan: Four.\nman: Five."
+        self.assertEqual(
+            list(coalesce_speaker_turns(iter_conversation_parts(text))),
+            [("Man", "One. Two."), ("Woman", "Three."), ("Man", "Four. Five.")],
+        )
+
+    def test_empty_text_has_no_turns(self):
+        """Blank input produces no conversation parts."""
+        self.assertEqual(extract_conversation_from_text("  \n "), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
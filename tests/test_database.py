@@ -0,0 +1,156 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import database as db
+
+
+class TestDatabase(unittest.TestCase):
+
+    def setUp(self):
+        """Create a fresh file-backed database for each test."""
+        self.test_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.test_dir, "test_jobs.db")
+        self.conn = db.create_connection(self.db_file)
+        db.create_tables(self.conn)
+
+    def tearDown(self):
+        """Close the connection and remove the temporary database."""
+        db.close_connection(self.conn)
+        db.close_reader_connections()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _create_job(self, job_name="test_job"):
+        return db.create_job(self.conn, job_name, "/path/to/file.txt", self.test_dir,
+                             "kokoro", "a", "af_heart", 1.0, "cpu", True)
+
+    def test_connection_uses_wal(self):
+        """File-backed connections should run in WAL mode with synchronous=NORMAL."""
+        journal_mode = self.conn.execute("PRAGMA journal_mode;").fetchone()[0]
+        synchronous = self.conn.execute("PRAGMA synchronous;").fetchone()[0]
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(synchronous, 1)  # NORMAL
+        self.assertEqual(self.conn.execute("PRAGMA page_size;").fetchone()[0], 8192)
+
+    def test_claim_and_complete_chunks(self):
+        """Chunks are claimed in index order and reflected in the job stats."""
+        job_id = self._create_job()
+        db.create_chunks(self.conn, job_id, ["First.", "  ", "Second."])
+
+        first = db.claim_chunk(self.conn, job_id)
+        self.assertEqual(first['chunk_index'], 0)
+        self.assertEqual(first['status'], 'processing')
+        db.update_chunk_status(self.conn, first['id'], 'completed', "/tmp/a.wav")
+
+        second = db.claim_chunk(self.conn, job_id)
+        self.assertEqual(second['text'], "Second.")
+        db.update_chunk_status(self.conn, second['id'], 'failed')
+
+        self.assertIsNone(db.claim_chunk(self.conn, job_id))
+        self.assertEqual(db.get_chunk_status(self.conn, job_id, 0), 'completed')
+        self.assertIsNone(db.get_chunk_status(self.conn, job_id, 2))
+        stats = db.get_job_stats(self.conn, job_id)
+        self.assertEqual(stats['total'], 2)
+        self.assertEqual(stats['completed'], 1)
+        self.assertEqual(stats['failed'], 1)
+
+        self.assertEqual(db.reset_failed_chunks(self.conn, job_id), 1)
+        self.assertEqual(db.get_job_stats(self.conn, job_id).get('pending'), 1)
+
+        changes = self.conn.total_changes
+        self.assertEqual(db.reset_failed_chunks(self.conn, job_id), 0)
+        self.assertEqual(self.conn.total_changes, changes)
+
+    def test_chunk_voices_are_stored_per_chunk(self):
+        """Per-chunk voices line up with their text after blank chunks are dropped."""
+        job_id = self._create_job()
+        db.create_chunks(self.conn, job_id, ["Hi.", " ", "Hello."], ["am_adam", "af_heart", None])
+        chunks = [(c['chunk_index'], c['text'], c['voice']) for c in db.get_chunks_for_job(self.conn, job_id)]
+        self.assertEqual(chunks, [(0, "Hi.", "am_adam"), (1, "Hello.", None)])
+
+    def test_chunks_created_in_batches_continue_the_index(self):
+        """Later batches are numbered after the chunks already created."""
+        job_id = self._create_job()
+        self.assertEqual(db.create_chunks(self.conn, job_id, ["One.", " "]), 1)
+        self.assertEqual(db.create_chunks(self.conn, job_id, ["Two.", "Three."], start_index=1), 2)
+        chunks = [(c['chunk_index'], c['text']) for c in db.get_chunks_for_job(self.conn, job_id)]
+        self.assertEqual(chunks, [(0, "One."), (1, "Two."), (2, "Three.")])
+
+    def test_get_chunks_for_job_streams_in_order(self):
+        """Chunks are yielded lazily in chunk_index order."""
+        job_id = self._create_job()
+        db.create_chunks(self.conn, job_id, ["One.", "Two.", "Three."])
+        chunks = db.get_chunks_for_job(self.conn, job_id)
+        self.assertFalse(isinstance(chunks, list))
+        self.assertEqual([c['text'] for c in chunks], ["One.", "Two.", "Three."])
+
+    def test_reader_connection_is_read_only_and_per_thread(self):
+        """Reader connections are reused per thread and reject writes."""
+        job_id = self._create_job()
+        reader = db.get_reader_connection(self.db_file)
+        self.assertIs(reader, db.get_reader_connection(self.db_file))
+        self.assertEqual(db.get_job_by_name(reader, "test_job")['id'], job_id)
+        with self.assertRaises(sqlite3.OperationalError):
+            reader.execute("DELETE FROM jobs")
+
+    def test_flush_chunk_updates_applies_batch(self):
+        """A batch of buffered updates is written in one call."""
+        job_id = self._create_job()
+        db.create_chunks(self.conn, job_id, ["One.", "Two.", "Three."])
+        claimed = [db.claim_chunk(self.conn, job_id) for _ in range(3)]
+        updates = [('completed', f"/tmp/{c['chunk_index']}.wav", c['id']) for c in claimed[:2]]
+        updates.append(('failed', None, claimed[2]['id']))
+        self.assertTrue(db.flush_chunk_updates(self.conn, updates))
+        stats = db.get_job_stats(self.conn, job_id)
+        self.assertEqual(stats['completed'], 2)
+        self.assertEqual(stats['failed'], 1)
+        self.assertNotIn('processing', stats)
+
+    def test_status_counters_backfilled_for_existing_databases(self):
+        """Databases created before the counter columns existed are migrated."""
+        legacy_file = os.path.join(self.test_dir, "legacy.db")
+        legacy = sqlite3.connect(legacy_file)
+        legacy.executescript("""
+            CREATE TABLE jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, job_name TEXT NOT NULL UNIQUE,
+                               status TEXT NOT NULL DEFAULT 'pending');
+            CREATE TABLE chunks (id INTEGER PRIMARY KEY AUTOINCREMENT, job_id INTEGER NOT NULL,
+                                 chunk_index INTEGER NOT NULL, text TEXT NOT NULL,
+                                 status TEXT NOT NULL DEFAULT 'pending', audio_file_path TEXT,
+                                 retries INTEGER DEFAULT 0, UNIQUE (job_id, chunk_index));
+            INSERT INTO jobs (job_name) VALUES ('old_job');
+            INSERT INTO chunks (job_id, chunk_index, text, status) VALUES
+                (1, 0, 'a', 'completed'), (1, 1, 'b', 'completed'), (1, 2, 'c', 'pending');
+        """)
+        legacy.close()
+
+        conn = db.create_connection(legacy_file)
+        try:
+            db.create_tables(conn)
+            self.assertEqual(db.get_job_stats(conn, 1), {'completed': 2, 'pending': 1, 'total': 3})
+            legacy_job = db.get_job_by_name(conn, 'old_job')
+            self.assertEqual((legacy_job['dtype'], legacy_job['warmup']), ('fp32', 0))
+            db.claim_chunk(conn, 1)
+            self.assertEqual(db.get_job_stats(conn, 1), {'completed': 2, 'processing': 1, 'total': 3})
+        finally:
+            db.close_connection(conn)
+
+    def test_get_all_jobs_returns_summaries(self):
+        """Job summaries expose their fields by attribute."""
+        job_id = self._create_job()
+        jobs = db.get_all_jobs(self.conn)
+        self.assertEqual(len(jobs), 1)
+        self.assertIsInstance(jobs[0], db.JobSummary)
+        self.assertEqual((jobs[0].id, jobs[0].job_name, jobs[0].status), (job_id, "test_job", "pending"))
+
+    def test_duplicate_job_returns_existing_id(self):
+        """Creating a job with an existing name returns the original ID."""
+        job_id = self._create_job()
+        self.assertEqual(self._create_job(), job_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
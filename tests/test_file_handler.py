@@ -0,0 +1,73 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.file_handler import ensure_dir_exists, get_safe_filename, index_segment_files
+
+
+class TestIndexSegmentFiles(unittest.TestCase):
+
+    def setUp(self):
+        """Create an output directory with segment files in scrambled order."""
+        self.test_dir = tempfile.mkdtemp()
+        names = [
+            "my_job_chunk_0010_segment_000.wav",
+            "my_job_chunk_0002_segment_010.wav",
+            "my_job_chunk_0002_segment_002.wav",
+            "my_job_merged.wav",
+            "my_job_chunk_x_chunk_0001_segment_000.wav",
+            "other_chunk_0000_segment_000.wav",
+        ]
+        for name in names:
+            open(os.path.join(self.test_dir, name), "wb").close()
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_segments_grouped_by_chunk_in_numeric_order(self):
+        """Only the job's segments are returned, ordered by chunk then segment number."""
+        segments = index_segment_files(self.test_dir, "my job")
+        self.assertEqual(list(segments), [2, 10])
+        self.assertEqual(
+            [os.path.basename(path) for path in segments[2]],
+            ["my_job_chunk_0002_segment_002.wav", "my_job_chunk_0002_segment_010.wav"],
+        )
+
+    def test_missing_directory_is_empty(self):
+        """A job that has not written anything yet has no segments."""
+        self.assertEqual(index_segment_files(os.path.join(self.test_dir, "missing"), "my_job"), {})
+
+
+class TestGetSafeFilename(unittest.TestCase):
+
+    def test_ascii_and_unicode_names_follow_the_same_rules(self):
+        """Unsafe characters and spaces become underscores; letters of any script are kept."""
+        self.assertEqual(get_safe_filename("my job: part/1 (v2).wav"), "my_job__part_1__v2_.wav")
+        self.assertEqual(get_safe_filename("chapitre é/1"), "chapitre_é_1")
+
+
+class TestEnsureDirExists(unittest.TestCase):
+
+    def setUp(self):
+        """Create a scratch directory to create output directories in."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_directory_removed_between_calls_is_recreated(self):
+        """A directory deleted after an earlier call is created again."""
+        output_dir = os.path.join(self.test_dir, "output")
+        ensure_dir_exists(output_dir)
+        os.rmdir(output_dir)
+        ensure_dir_exists(output_dir)
+        self.assertTrue(os.path.isdir(output_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import wave
+from argparse import Namespace
+from unittest.mock import patch
+
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import database as db
+from main import merge_chunks_in_order, prepare_job_chunks, resume_job
+
+
+class TestResumeJob(unittest.TestCase):
+
+    def setUp(self):
+        """Create a fresh database with one job."""
+        self.test_dir = tempfile.mkdtemp()
+        self.conn = db.create_connection(os.path.join(self.test_dir, "test_jobs.db"))
+        db.create_tables(self.conn)
+        self.job_id = db.create_job(self.conn, "test_job", "/path/to/file.txt", self.test_dir,
+                                    "kokoro", "a", "af_heart", 1.0, "cpu", True)
+        db.create_chunks(self.conn, self.job_id, ["First sentence.", "Second sentence."])
+
+    def tearDown(self):
+        """Close the connection and remove the temporary database."""
+        db.close_connection(self.conn)
+        db.close_reader_connections()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_resume_resets_failed_chunks(self):
+        """A fully chunked job is resumed and its failed chunks are retried."""
+        db.update_job_status(self.conn, self.job_id, 'failed')
+        chunk = db.claim_chunk(self.conn, self.job_id)
+        db.update_chunk_status(self.conn, chunk['id'], 'failed')
+
+        self.assertEqual(resume_job(self.conn, "test_job"), "test_job")
+        self.assertEqual(db.get_chunk_status(self.conn, self.job_id, 0), 'pending')
+
+    def test_job_interrupted_while_preparing_is_not_resumed(self):
+        """A job whose chunks were only partly created must be started again."""
+        db.update_job_status(self.conn, self.job_id, 'preparing')
+
+        self.assertIsNone(resume_job(self.conn, "test_job"))
+
+    def test_unknown_job_is_not_resumed(self):
+        """Resuming a job that does not exist does nothing."""
+        self.assertIsNone(resume_job(self.conn, "no_such_job"))
+
+
+class TestPrepareJobChunks(unittest.TestCase):
+
+    def setUp(self):
+        """Create a fresh database with one job and two text inputs."""
+        self.test_dir = tempfile.mkdtemp()
+        self.conn = db.create_connection(os.path.join(self.test_dir, "test_jobs.db"))
+        db.create_tables(self.conn)
+        self.job_id = db.create_job(self.conn, "test_job", "inputs", self.test_dir,
+                                    "kokoro", "a", "af_heart", 1.0, "cpu", True)
+        self.first = os.path.join(self.test_dir, "first.txt")
+        self.second = os.path.join(self.test_dir, "second.txt")
+        with open(self.first, "w", encoding="utf-8") as f:
+            f.write("First paragraph.\n\nSecond paragraph.")
+
+    def tearDown(self):
+        """Close the connection and remove the temporary files."""
+        db.close_connection(self.conn)
+        db.close_reader_connections()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _prepare(self, *paths):
+        args = Namespace(conversation=None, pdf=None, text=None, text_file=list(paths), paragraphs_per_chunk=10)
+        return prepare_job_chunks(self.conn, self.job_id, "test_job", args)
+
+    def test_all_inputs_are_chunked(self):
+        """Readable inputs are chunked and the job is released to the workers."""
+        with open(self.second, "w", encoding="utf-8") as f:
+            f.write("Third paragraph.")
+
+        self.assertTrue(self._prepare(self.first, self.second))
+        self.assertEqual(db.get_job_status(self.conn, self.job_id), 'processing')
+
+    def test_missing_input_fails_the_job(self):
+        """The job fails instead of being processed without one of its inputs."""
+        self.assertFalse(self._prepare(self.first, self.second))
+        self.assertEqual(db.get_job_status(self.conn, self.job_id), 'failed')
+
+    def test_empty_input_fails_the_job(self):
+        """An input without any text fails the job too."""
+        with open(self.second, "w", encoding="utf-8") as f:
+            f.write("\n\n")
+
+        self.assertFalse(self._prepare(self.first, self.second))
+        self.assertEqual(db.get_job_status(self.conn, self.job_id), 'failed')
+
+
+class TestMergeChunksInOrder(unittest.TestCase):
+
+    def setUp(self):
+        """Create a job with two chunks: the first done, the second half written."""
+        self.test_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.test_dir, "test_jobs.db")
+        self.conn = db.create_connection(self.db_file)
+        db.create_tables(self.conn)
+        self.job_id = db.create_job(self.conn, "test_job", "inputs", self.test_dir,
+                                    "kokoro", "a", "af_heart", 1.0, "cpu", True)
+        db.create_chunks(self.conn, self.job_id, ["First chunk.", "Second chunk."])
+        first = db.claim_chunk(self.conn, self.job_id)
+        self.second = db.claim_chunk(self.conn, self.job_id)
+        db.update_chunk_status(self.conn, first['id'], 'completed')
+        self._write_segment(0, 0)
+        self._write_segment(0, 1)
+        self._write_segment(1, 0)
+
+    def tearDown(self):
+        """Close the connection and remove the temporary files."""
+        db.close_connection(self.conn)
+        db.close_reader_connections()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write_segment(self, chunk_index, segment_index, frames=100):
+        path = os.path.join(self.test_dir, f"test_job_chunk_{chunk_index:04d}_segment_{segment_index:03d}.wav")
+        with wave.open(path, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(24000)
+            wav_file.writeframes(b"\x00\x00" * frames)
+
+    def test_segments_written_after_an_earlier_scan_are_merged(self):
+        """A chunk seen part-written by one scan is merged with all of its segments."""
+        workers_done = threading.Event()
+        merged_path = os.path.join(self.test_dir, "test_job_merged.wav")
+
+        def finish_second_chunk(_):
+            # The second chunk finishes while the merger waits for it
+            self._write_segment(1, 1)
+            db.update_chunk_status(self.conn, self.second['id'], 'completed')
+            workers_done.set()
+
+        reader = db.get_reader_connection
+        with patch.object(db, 'get_reader_connection', lambda: reader(self.db_file)), \
+                patch('main.time.sleep', side_effect=finish_second_chunk):
+            self.assertTrue(merge_chunks_in_order(self.job_id, "test_job", self.test_dir, merged_path, workers_done))
+
+        with wave.open(merged_path, "rb") as merged:
+            self.assertEqual(merged.getnframes(), 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from unittest.mock import patch
+import os
+
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import resource_limiter
+from utils.resource_limiter import cap_workers_for_device, partition_cpu_cores
+
+
+class TestResourceLimiter(unittest.TestCase):
+
+    @patch.object(resource_limiter, '_INITIAL_CPU_CORES', [0, 1, 2, 3, 4, 5, 6, 7])
+    def test_workers_get_disjoint_core_slices(self):
+        """Each worker is pinned to its own contiguous share of the cores."""
+        slices = [partition_cpu_cores(slot, 3) for slot in range(3)]
+        self.assertEqual(slices, [[0, 1], [2, 3], [4, 5]])
+        self.assertEqual(partition_cpu_cores(1, 2, max_cores=4), [2, 3])
+        self.assertIsNone(partition_cpu_cores(0, 9))
+
+    @patch.object(resource_limiter, '_INITIAL_CPU_CORES', [0, 1, 2, 3, 4, 5, 6, 7])
+    def test_repinning_a_reused_worker_keeps_its_slice(self):
+        """A worker pinned by one job gets the same cores for the next job."""
+        first = partition_cpu_cores(1, 2)
+        # The worker process is now restricted to its slice
+        with patch('os.sched_getaffinity', create=True, return_value=set(first)):
+            self.assertEqual(partition_cpu_cores(1, 2), first)
+        self.assertEqual(first, [4, 5, 6, 7])
+
+    def test_gpu_jobs_use_one_worker(self):
+        """Only CPU jobs keep more than one worker."""
+        self.assertEqual(cap_workers_for_device(4, 'cuda'), 1)
+        self.assertEqual(cap_workers_for_device(4, 'mps'), 1)
+        self.assertEqual(cap_workers_for_device(4, 'cpu'), 4)
+        self.assertEqual(cap_workers_for_device(4, None), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import re
+
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.split_text import balance_chunks, iter_text_chunks, smart_split_text, split_text_into_chunks
+
+
+class TestSmartSplitText(unittest.TestCase):
+
+    def setUp(self):
+        """Build a text long enough to be split into several segments."""
+        self.sentences = [f"Sentence number {i} is long enough to stand on its own in the output" for i in range(40)]
+        self.long_text = ".\n".join(self.sentences) + "."
+
+    def test_short_text_is_not_split(self):
+        """Short inputs come back as a single stripped segment."""
+        self.assertEqual(smart_split_text("  Hello world. Bye.  "), ["Hello world. Bye."])
+
+    def test_empty_text_returns_empty_list(self):
+        """Whitespace-only input produces no segments."""
+        self.assertEqual(smart_split_text("   \n "), [])
+
+    def test_string_and_compiled_patterns_agree(self):
+        """A pattern string and its precompiled form produce the same segments."""
+        pattern = r"[.!?]\s"
+        self.assertEqual(smart_split_text(self.long_text, pattern),
+                         smart_split_text(self.long_text, re.compile(pattern)))
+
+    def test_long_text_is_split_and_keeps_all_sentences(self):
+        """Long inputs are split into several segments without losing text."""
+        segments = smart_split_text(self.long_text)
+        self.assertGreater(len(segments), 1)
+        joined = " ".join(segments)
+        for sentence in self.sentences:
+            self.assertIn(sentence, joined)
+
+
+class TestSplitTextIntoChunks(unittest.TestCase):
+
+    def test_groups_paragraphs(self):
+        """Paragraphs are grouped into chunks of at most N paragraphs."""
+        text = "\n\n".join(f"Paragraph {i}." for i in range(5))
+        chunks = split_text_into_chunks(text, max_paragraphs_per_chunk=2)
+        self.assertEqual(chunks, ["Paragraph 0.\n\nParagraph 1.", "Paragraph 2.\n\nParagraph 3.", "Paragraph 4."])
+
+    def test_normalizes_windows_newlines(self):
+        """CRLF paragraph breaks are treated like LF ones."""
+        chunks = split_text_into_chunks("One.\r\n\r\nTwo.\r\n", max_paragraphs_per_chunk=10)
+        self.assertEqual(chunks, ["One.\n\nTwo."])
+
+    def test_empty_text_returns_empty_list(self):
+        """Whitespace-only input produces no chunks."""
+        self.assertEqual(split_text_into_chunks(" \n\n "), [])
+
+    def test_streamed_pieces_match_whole_text(self):
+        """Paragraphs and CRLF breaks split across pieces are chunked like the whole text."""
+        text = "One a.\r\n\r\nTwo b\nstill two.\n \nThree.\r\n\r\nFour."
+        pieces = ["One a.\r", "\n", "\r\nTwo b\nst", "ill two.\n", " \nThree.\r\n\r\nFo", "ur."]
+        self.assertEqual(list(iter_text_chunks(pieces, 2)), split_text_into_chunks(text, 2))
+        self.assertEqual(list(iter_text_chunks(pieces, 2)), ["One a.\n\nTwo b\nstill two.", "Three.\n\nFour."])
+
+    def test_balance_chunks_resplits_too_few_chunks(self):
+        """A single large chunk is regrouped into several, keeping the text in order."""
+        sentences = [f"Sentence number {i} is long enough to stand on its own in the output" for i in range(40)]
+        chunk = ".\n".join(sentences) + "."
+        balanced = balance_chunks([chunk], 4)
+        self.assertEqual(len(balanced), 4)
+        # Every word is kept, including each sentence's final period
+        self.assertEqual(" ".join(balanced).split(), chunk.split())
+        self.assertTrue(all(text.endswith(".") for text in balanced))
+        self.assertEqual(balance_chunks(["One.", "Two."], 2), ["One.", "Two."])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.synthesis_cache import CACHE_KEY_FIELDS, SynthesisCache
+
+
+class TestSynthesisCache(unittest.TestCase):
+
+    def setUp(self):
+        """Create a cache directory and a fake generated segment."""
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, "cache")
+        self.settings = {field: None for field in CACHE_KEY_FIELDS}
+        self.settings.update(engine="kokoro", lang="a", voice="af_heart", speed=1.0)
+        self.segment = os.path.join(self.test_dir, "segment.wav")
+        with open(self.segment, "wb") as f:
+            f.write(b"RIFF-audio")
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_store_then_fetch_copies_audio(self):
+        """A stored segment is returned for the same text and options."""
+        cache = SynthesisCache(self.settings, self.cache_dir)
+        key = cache.make_key("Hello there.")
+        dest = os.path.join(self.test_dir, "out.wav")
+        self.assertFalse(cache.fetch(key, dest))
+
+        cache.store(key, self.segment)
+        self.assertTrue(cache.fetch(key, dest))
+        with open(dest, "rb") as f:
+            self.assertEqual(f.read(), b"RIFF-audio")
+
+    def test_fetch_links_instead_of_copying(self):
+        """A hit shares the cached file rather than writing a new copy."""
+        cache = SynthesisCache(self.settings, self.cache_dir)
+        key = cache.make_key("Hello there.")
+        cache.store(key, self.segment)
+        dest = os.path.join(self.test_dir, "out.wav")
+        with open(dest, "wb") as f:
+            f.write(b"stale")
+        self.assertTrue(cache.fetch(key, dest))
+        self.assertTrue(os.path.samefile(dest, os.path.join(self.cache_dir, f"{key}.wav")))
+        self.assertEqual(sorted(os.listdir(self.test_dir)), ["cache", "out.wav", "segment.wav"])
+
+    def test_key_depends_on_text_and_options(self):
+        """Different text or generation options never share an entry."""
+        cache = SynthesisCache(self.settings, self.cache_dir)
+        faster = SynthesisCache(dict(self.settings, speed=1.5), self.cache_dir)
+        self.assertNotEqual(cache.make_key("One."), cache.make_key("Two."))
+        self.assertNotEqual(cache.make_key("One."), faster.make_key("One."))
+        self.assertEqual(cache.make_key("One."), SynthesisCache(self.settings, self.cache_dir).make_key("One."))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Storing past max_entries drops the oldest entries first."""
+        cache = SynthesisCache(self.settings, self.cache_dir, max_entries=10)
+        keys = [cache.make_key(f"Segment {i}.") for i in range(11)]
+        for i, key in enumerate(keys):
+            # Separate files: entries are hard links, and links share an mtime
+            segment = os.path.join(self.test_dir, f"segment_{i}.wav")
+            with open(segment, "wb") as f:
+                f.write(b"RIFF-audio")
+            cache.store(key, segment)
+            entry = os.path.join(self.cache_dir, f"{key}.wav")
+            os.utime(entry, (i, i))  # Deterministic ages: earlier keys are older
+
+        dest = os.path.join(self.test_dir, "out.wav")
+        self.assertFalse(cache.fetch(keys[0], dest))
+        self.assertTrue(cache.fetch(keys[-1], dest))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
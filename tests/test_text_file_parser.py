@@ -0,0 +1,43 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.text_file_parser import extract_text_from_txt, iter_text_file
+
+
+class TestTextFileParser(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary directory for the test files."""
+        self.test_dir = tempfile.mkdtemp()
+        self.txt_file = os.path.join(self.test_dir, "book.txt")
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_blocks_split_inside_a_character(self):
+        """Multi-byte characters cut by a block boundary are decoded whole."""
+        text = "Café über naïve façade.\n\nZweiter Absatz — ende."
+        with open(self.txt_file, "w", encoding="utf-8") as f:
+            f.write(text)
+        self.assertEqual("".join(iter_text_file(self.txt_file, block_size=3)), text)
+
+    def test_latin1_fallback_matches_whole_file_read(self):
+        """A file that is not UTF-8 is decoded as latin-1, as extract_text_from_txt does."""
+        with open(self.txt_file, "wb") as f:
+            f.write("Plain start. ".encode("ascii") * 10 + "Caf\xe9 cr\xe8me.".encode("latin-1"))
+        streamed = "".join(iter_text_file(self.txt_file, block_size=16))
+        self.assertEqual(streamed, extract_text_from_txt(self.txt_file))
+
+    def test_missing_file_raises(self):
+        """A file that cannot be read is an error, not an empty input."""
+        with self.assertRaises(FileNotFoundError):
+            list(iter_text_file(os.path.join(self.test_dir, "missing.txt")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -69,20 +69,25 @@ class ChatterboxTTSProcessor:
         self.tts_lock = threading.Lock()
         self.enable_voice_cloning = enable_voice_cloning
 
-    # Defaults; can be overridden by set_generation_params or per-call
+        # Defaults; can be overridden by set_generation_params or per-call
         self.default_audio_prompt_path: Optional[str] = None
 
         self.default_temperature: float = 0.8
         self.default_top_p: float = 1.0
         self.default_repetition_penalty: float = 1.2
 
-        self.default_repetition_penalty: float = 1.2
+        # Prepared prompt files by (source path, modification time), so a
+        # prompt is resampled and written out only once
+        self._prepared_prompts = {}
 
         self._initialize_model()
 
     def _prepare_audio_prompt(self, audio_path: str) -> str:
         """Pre-processes the audio prompt to ensure optimal format and sample rate.
 
+        The result is remembered per file, so passing the same prompt again
+        (per call, or for another job reusing this processor) costs a stat.
+
         Args:
             audio_path: Path to the input audio file.
 
@@ -90,9 +95,28 @@ class ChatterboxTTSProcessor:
             Path to the optimized temporary audio file.
         """
         if not os.path.exists(audio_path):
-            logger.warning(f"Audio prompt not found: {audio_path}")
+            logger.warning("Audio prompt not found: %s", audio_path)
             return audio_path
 
+        try:
+            key = (audio_path, os.stat(audio_path).st_mtime_ns)
+        except OSError:
+            key = (audio_path, None)
+        prepared = self._prepared_prompts.get(key)
+        if prepared is None or not os.path.exists(prepared):
+            prepared = self._prepared_prompts[key] = self._optimize_audio_prompt(audio_path)
+        return prepared
+
+    def _optimize_audio_prompt(self, audio_path: str) -> str:
+        """Resamples an audio prompt to the model's rate as mono and saves it to a temporary file.
+
+        Args:
+            audio_path: Path to the input audio file.
+
+        Returns:
+            Path to the optimized temporary audio file, or `audio_path` if it
+            could not be processed.
+        """
         try:
             # Load audio
             waveform, sample_rate = torchaudio.load(audio_path)
@@ -100,15 +124,15 @@ class ChatterboxTTSProcessor:
             # Check duration
             duration = waveform.shape[1] / sample_rate
             if duration < 3.0:
-                logger.warning(f"Audio prompt '{audio_path}' is too short ({duration:.2f}s). Recommended: 7-20s.")
+                logger.warning("Audio prompt '%s' is too short (%.2fs). Recommended: 7-20s.", audio_path, duration)
             elif duration > 20.0:
-                logger.warning(f"Audio prompt '{audio_path}' is longer than recommended ({duration:.2f}s).")
+                logger.warning("Audio prompt '%s' is longer than recommended (%.2fs).", audio_path, duration)
 
             # Target sample rate (default to 24000 if model sr not available, though it should be)
             target_sr = getattr(self.model, 'sr', 24000)
 
             if sample_rate != target_sr:
-                logger.info(f"Resampling audio prompt from {sample_rate}Hz to {target_sr}Hz.")
+                logger.info("Resampling audio prompt from %sHz to %sHz.", sample_rate, target_sr)
                 resampler = torchaudio.transforms.Resample(orig_freq=sample_rate, new_freq=target_sr)
                 waveform = resampler(waveform)
 
@@ -122,11 +146,11 @@ class ChatterboxTTSProcessor:
             temp_file.close()
             
             torchaudio.save(temp_path, waveform, target_sr)
-            logger.info(f"Optimized audio prompt saved to: {temp_path}")
+            logger.info("Optimized audio prompt saved to: %s", temp_path)
             return temp_path
 
         except Exception as e:
-            logger.error(f"Failed to optimize audio prompt '{audio_path}': {e}")
+            logger.error("Failed to optimize audio prompt '%s': %s", audio_path, e)
             return audio_path
 
     def _autodetect_device(self) -> str:
@@ -151,12 +175,12 @@ class ChatterboxTTSProcessor:
         Raises:
             Exception: If the model fails to load.
         """
-        logger.info(f"Initializing Chatterbox Turbo TTS on device='{self.device}'.")
+        logger.info("Initializing Chatterbox Turbo TTS on device='%s'.", self.device)
         try:
             self.model = _ChatterboxTurboTTS.from_pretrained(device=self.device)
             logger.info("Chatterbox Turbo TTS model initialized successfully.")
         except Exception as e:
-            logger.error(f"Failed to load Chatterbox Turbo model: {e}")
+            logger.error("Failed to load Chatterbox Turbo model: %s", e)
             raise
 
     def set_generation_params(
@@ -219,7 +243,7 @@ class ChatterboxTTSProcessor:
             The full path to the generated WAV file, or None if generation fails.
         """
         if not text or not text.strip():
-            logger.warning(f"Empty text for base '{base_filename}'. Skipping.")
+            logger.warning("Empty text for base '%s'. Skipping.", base_filename)
             return None
         try:
             # Build generation kwargs; only include audio_prompt_path if voice cloning is enabled
@@ -238,10 +262,10 @@ class ChatterboxTTSProcessor:
             safe_base = get_safe_filename(base_filename)
             fpath = os.path.join(output_dir, f"{safe_base}.wav")
             sf.write(fpath, wav_np, self.model.sr)
-            logger.info(f"Saved audio file: {fpath}")
+            logger.debug("Saved audio file: %s", fpath)
             return fpath
         except Exception as e:
-            logger.error(f"Error generating audio for '{base_filename}': {e}")
+            logger.error("Error generating audio for '%s': %s", base_filename, e)
             return None
 
     def text_to_speech(
@@ -287,8 +311,7 @@ class ChatterboxTTSProcessor:
             return []
 
         # Resolve current params
-        # If a specific prompt is provided for this call, optimize it on the fly (or use as is if optimization fails)
-        # Note: Ideally, one should use set_generation_params for persistent prompts to avoid re-optimizing every call.
+        # A prompt given for this call is optimized on first use and reused after (or used as is if optimization fails)
         curr_prompt = self._prepare_audio_prompt(audio_prompt_path) if audio_prompt_path is not None else self.default_audio_prompt_path
 
         curr_temperature = self.default_temperature if temperature is None else float(temperature)
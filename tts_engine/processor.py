@@ -9,12 +9,18 @@ import soundfile as sf
 from kokoro import KPipeline
 import logging
 import os
+import re
 import threading
 
 from utils.file_handler import ensure_dir_exists, get_safe_filename
 
 logger = logging.getLogger(__name__)
 
+# Segments arrive already split (see utils.split_text), so Kokoro gets a pattern
+# that never matches. It is compiled once here rather than looked up in `re`'s
+# cache on every generation call.
+_NO_SPLIT_PATTERN = re.compile(r"(?!.*)")
+
 
 class KokoroTTSProcessor:
     """A thread-safe wrapper for the Kokoro Text-to-Speech (TTS) pipeline.
@@ -68,7 +74,7 @@ class KokoroTTSProcessor:
             Exception: If the pipeline fails to initialize for any reason.
         """
         logger.info(
-            f"Initializing Kokoro TTS pipeline for lang_code='{self.lang_code}' on device='{self.device or 'auto'}'..."
+            "Initializing Kokoro TTS pipeline for lang_code='%s' on device='%s'...", self.lang_code, self.device or 'auto'
         )
         try:
             if self.device:
@@ -83,26 +89,38 @@ class KokoroTTSProcessor:
                             torch.cuda.set_device(self.device)
                         except Exception as e:
                             logger.warning(
-                                f"Could not explicitly set CUDA device {self.device}, PyTorch will manage: {e}"
+                                "Could not explicitly set CUDA device %s, PyTorch will manage: %s", self.device, e
                             )
                 else:
                     logger.info(
-                        f"Device '{self.device}' requested. Model will run on CPU if not available/supported or auto-detected."
+                        "Device '%s' requested. Model will run on CPU if not available/supported or auto-detected.", self.device
                     )
 
             self.pipeline = KPipeline(lang_code=self.lang_code, repo_id='hexgrad/Kokoro-82M')
             logger.info("Kokoro TTS pipeline initialized successfully.")
         except Exception as e:
-            logger.error(f"Failed to initialize Kokoro TTS pipeline: {e}")
+            logger.error("Failed to initialize Kokoro TTS pipeline: %s", e)
             logger.error(
                 "Please ensure 'espeak-ng' is installed correctly on your system."
             )
             if self.lang_code not in ["a", "b"]:
                 logger.error(
-                    f"For lang_code '{self.lang_code}', ensure you have 'misaki[{self.lang_code_to_misaki_ext()}]' installed."
+                    "For lang_code '%s', ensure you have 'misaki[%s]' installed.", self.lang_code, self.lang_code_to_misaki_ext()
                 )
             raise
 
+    def quantize_int8(self):
+        """Quantizes the model's linear and LSTM layers to int8 for CPU inference.
+
+        Dynamic quantization stores these weights as int8 and quantizes
+        activations on the fly, which roughly halves the memory traffic of
+        the dominant layers. It only runs on the CPU.
+        """
+        self.pipeline.model = torch.ao.quantization.quantize_dynamic(
+            self.pipeline.model, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8
+        )
+        logger.info("Quantized the Kokoro model's linear and LSTM layers to int8.")
+
     def lang_code_to_misaki_ext(self) -> str:
         """Maps a Kokoro language code to its Misaki model extension.
 
@@ -124,7 +142,7 @@ class KokoroTTSProcessor:
         self.default_voice = voice
         self.default_speed = speed
         logger.debug(
-            f"Processor generation params set: voice={voice}, speed={speed} (external splitting)"
+            "Processor generation params set: voice=%s, speed=%s (external splitting)", voice, speed
         )
 
     def _generate_audio_core(
@@ -160,19 +178,20 @@ class KokoroTTSProcessor:
 
         if not text or not text.strip():
             logger.warning(
-                f"Input text for '{base_filename}' is empty. No audio will be generated."
+                "Input text for '%s' is empty. No audio will be generated.", base_filename
             )
             return []
 
         ensure_dir_exists(output_dir)
         safe_base_filename = get_safe_filename(base_filename)
-        logger.info(
-            f"Thread {threading.get_ident()}: Generating audio for '{safe_base_filename}', voice='{voice}', speed={speed}."
+        # Per-segment progress is DEBUG: at INFO it would be rendered once per sentence
+        logger.debug(
+            "Thread %s: Generating audio for '%s', voice='%s', speed=%s.", threading.get_ident(), safe_base_filename, voice, speed
         )
         output_path = os.path.join(output_dir, f"{safe_base_filename}.wav")
         try:
             generator = self.pipeline(
-                text.strip(), voice=voice, speed=speed, split_pattern=r"(?!.*)"
+                text.strip(), voice=voice, speed=speed, split_pattern=_NO_SPLIT_PATTERN
             )
             for i, (graphemes, phonemes, audio_data) in enumerate(generator):
                 sf.write(output_path, audio_data, 24000)
@@ -180,11 +199,11 @@ class KokoroTTSProcessor:
             if os.path.exists(output_path):
                 return [output_path]
             else:
-                logger.warning(f"No audio generated for '{safe_base_filename}'.")
+                logger.warning("No audio generated for '%s'.", safe_base_filename)
                 return []
         except Exception as e:
             logger.error(
-                f"Thread {threading.get_ident()}: Error generating audio for '{safe_base_filename}': {e}"
+                "Thread %s: Error generating audio for '%s': %s", threading.get_ident(), safe_base_filename, e
             )
             return []
 
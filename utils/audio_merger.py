@@ -1,9 +1,14 @@
 import logging
 from pydub import AudioSegment
 import os
+import struct
+import wave
 
 logger = logging.getLogger(__name__)
 
+# Buffer size for copying audio when it cannot be copied in the kernel
+COPY_BUFFER_SIZE = 1 << 20
+
 # Pydub will automatically search for ffmpeg in the system's PATH.
 # The following line is removed to ensure cross-platform compatibility.
 # AudioSegment.converter = "/usr/bin/ffmpeg"
@@ -12,6 +17,9 @@ def merge_audio_files(audio_file_paths: list[str], output_merged_path: str) -> b
     """
     Merges a list of audio files (WAV) into a single audio file.
 
+    The decoded audio is kept in memory and written out once. Files whose
+    format differs from the first file's are converted to it.
+
     Args:
         audio_file_paths: A list of paths to the audio files to merge.
                           The files are assumed to be in WAV format and
@@ -26,25 +34,39 @@ def merge_audio_files(audio_file_paths: list[str], output_merged_path: str) -> b
         return False
 
     logger.info(
-        f"Attempting to merge {len(audio_file_paths)} audio files into {output_merged_path}."
+        "Attempting to merge %s audio files into %s.", len(audio_file_paths), output_merged_path
     )
 
     try:
         # Ensure all files exist before starting
         for f_path in audio_file_paths:
             if not os.path.exists(f_path):
-                logger.error(f"Audio file for merging not found: {f_path}")
+                logger.error("Audio file for merging not found: %s", f_path)
                 return False
 
-        # Load the first audio file as the base
-        combined_audio = AudioSegment.from_wav(audio_file_paths[0])
-        logger.debug(f"Loaded initial segment: {audio_file_paths[0]}")
+        # Load the first audio file; its format is used for the merged file
+        first_segment = AudioSegment.from_wav(audio_file_paths[0])
+        logger.debug("Loaded initial segment: %s", audio_file_paths[0])
 
-        # Append the rest of the audio files
-        for i in range(1, len(audio_file_paths)):
-            segment = AudioSegment.from_wav(audio_file_paths[i])
-            combined_audio += segment
-            logger.debug(f"Appended segment: {audio_file_paths[i]}")
+        # Collect the raw PCM of every segment and join it once at the end.
+        # Appending with `+=` would copy the whole growing recording per segment.
+        pcm_parts = [first_segment.raw_data]
+        for f_path in audio_file_paths[1:]:
+            segment = (
+                AudioSegment.from_wav(f_path)
+                .set_channels(first_segment.channels)
+                .set_frame_rate(first_segment.frame_rate)
+                .set_sample_width(first_segment.sample_width)
+            )
+            pcm_parts.append(segment.raw_data)
+            logger.debug("Appended segment: %s", f_path)
+
+        combined_audio = AudioSegment(
+            data=b"".join(pcm_parts),
+            sample_width=first_segment.sample_width,
+            frame_rate=first_segment.frame_rate,
+            channels=first_segment.channels,
+        )
 
         # Export the combined audio
         # Ensure the output directory exists
@@ -55,14 +77,217 @@ def merge_audio_files(audio_file_paths: list[str], output_merged_path: str) -> b
             os.makedirs(output_dir, exist_ok=True)
 
         combined_audio.export(output_merged_path, format="wav")
-        logger.info(f"Successfully merged audio files into: {output_merged_path}")
+        logger.info("Successfully merged audio files into: %s", output_merged_path)
         return True
     except FileNotFoundError as e:  # Should be caught by pre-check, but good to have
-        logger.error(f"A file was not found during merging: {e}")
+        logger.error("A file was not found during merging: %s", e)
         return False
     except Exception as e:
-        logger.error(f"An error occurred during audio merging: {e}")
+        logger.error("An error occurred during audio merging: %s", e)
         logger.error(
             "Please ensure FFmpeg or libav is installed and accessible in your system's PATH if pydub requires it."
         )
         return False
+
+
+def _pcm_wav_header(channels: int, sample_width: int, frame_rate: int, data_size: int) -> bytes:
+    """Builds the 44-byte header of a PCM WAV file holding `data_size` bytes of audio."""
+    byte_rate = frame_rate * channels * sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, frame_rate, byte_rate, channels * sample_width, sample_width * 8,
+        b"data", data_size,
+    )
+
+
+def _open_pcm_data(wav_path: str):
+    """Opens a WAV file and locates its audio.
+
+    Returns:
+        The open binary file, positioned at the start of the audio, the
+        (channels, sample width, sample rate) tuple, and the audio size in
+        bytes. The caller must close the file.
+
+    Raises:
+        wave.Error: If the file is not a PCM WAV file.
+        EOFError: If the header is truncated.
+    """
+    wav_file = open(wav_path, "rb")
+    try:
+        # wave stops reading at the header of the data chunk, so the file is
+        # left positioned at the first byte of audio.
+        segment = wave.open(wav_file, "rb")
+        params = (segment.getnchannels(), segment.getsampwidth(), segment.getframerate())
+        return wav_file, params, segment.getnframes() * params[0] * params[1]
+    except BaseException:
+        wav_file.close()
+        raise
+
+
+def _copy_to(src_file, dst_file, count: int) -> int:
+    """Copies `count` bytes from the position of `src_file` to the position of `dst_file`.
+
+    The copy is done in the kernel with `os.copy_file_range` (Linux) or
+    `os.sendfile` when possible, so the audio never passes through Python;
+    otherwise it falls back to buffered reads and writes. `dst_file` must be
+    unbuffered, since its descriptor is written to directly.
+
+    Returns:
+        The number of bytes copied, which is less than `count` if `src_file`
+        ends early.
+    """
+    src_fd, dst_fd = src_file.fileno(), dst_file.fileno()
+    offset = src_file.tell()
+    copied = 0
+    try:
+        while copied < count:
+            if hasattr(os, "copy_file_range"):
+                n = os.copy_file_range(src_fd, dst_fd, count - copied, offset + copied)
+            else:
+                n = os.sendfile(dst_fd, src_fd, offset + copied, count - copied)
+            if not n:
+                return copied
+            copied += n
+    except OSError:
+        # Not supported for these files (e.g. macOS sendfile needs a socket)
+        src_file.seek(offset + copied)
+        while copied < count and (block := src_file.read(min(COPY_BUFFER_SIZE, count - copied))):
+            dst_file.write(block)
+            copied += len(block)
+    return copied
+
+
+def merge_wav_files(audio_file_paths: list[str], output_merged_path: str) -> bool:
+    """Merges PCM WAV files of one format into a single WAV file without decoding.
+
+    The headers are read first to size the output, so its header is written
+    once, and each file's audio is then copied straight after it, in the
+    kernel where the platform allows. Unlike `merge_audio_files` no ffmpeg or
+    pydub decoding is involved, so it only handles plain PCM WAV files that
+    share the channel count, sample width and sample rate of the first file.
+
+    Args:
+        audio_file_paths: The WAV files to merge, in playback order.
+        output_merged_path: The path where the merged audio file will be saved.
+
+    Returns:
+        True if merging was successful, False otherwise (for example if the
+        files differ in format; `merge_audio_files` can convert those).
+    """
+    if not audio_file_paths:
+        logger.warning("No audio files provided for merging.")
+        return False
+
+    try:
+        # Pass 1: headers only, to validate the formats and size the output
+        params = None
+        data_size = 0
+        for f_path in audio_file_paths:
+            wav_file, segment_params, segment_size = _open_pcm_data(f_path)
+            wav_file.close()
+            if params is None:
+                params = segment_params
+            elif segment_params != params:
+                logger.warning("%s has audio format %s, expected %s; cannot merge without converting.",
+                               f_path, segment_params, params)
+                return False
+            data_size += segment_size
+
+        # Pass 2: copy each file's audio after the final header
+        output_dir = os.path.dirname(output_merged_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(output_merged_path, "wb", buffering=0) as output:
+            output.write(_pcm_wav_header(*params, data_size))
+            for f_path in audio_file_paths:
+                wav_file, _, segment_size = _open_pcm_data(f_path)
+                with wav_file:
+                    if _copy_to(wav_file, output, segment_size) != segment_size:
+                        raise EOFError(f"{f_path} is shorter than its header states")
+            if data_size % 2:
+                output.write(b"\x00")  # RIFF chunks are padded to an even size
+    except (OSError, EOFError, wave.Error) as e:
+        logger.warning("Could not merge WAV files directly into %s: %s", output_merged_path, e)
+        if os.path.exists(output_merged_path):
+            os.remove(output_merged_path)
+        return False
+
+    logger.info("Merged %s WAV files into: %s", len(audio_file_paths), output_merged_path)
+    return True
+
+
+class WavAppender:
+    """Concatenates WAV files into a single output file, one file at a time.
+
+    Unlike `merge_audio_files`, each appended file is copied straight into the
+    open output file, so a merge can proceed while later segments are still
+    being synthesized and the recording is never held in memory as a whole.
+    All inputs must share the channel count, sample width and sample rate of
+    the first one, as segments produced by a single TTS engine do.
+
+    The header is written with placeholder sizes and only filled in on
+    `close`, so appending never seeks in the output (`wave.Wave_write` would
+    seek back to patch the header after every file), and the audio is copied
+    in the kernel where the platform allows.
+
+    Attributes:
+        output_path (str): The path of the merged WAV file.
+        segment_count (int): The number of files appended so far.
+    """
+
+    def __init__(self, output_path: str):
+        """Initializes the appender. The output file is created on the first append.
+
+        Args:
+            output_path: The path where the merged audio file will be written.
+        """
+        self.output_path = output_path
+        self.segment_count = 0
+        self._output = None
+        self._params = None
+        self._data_size = 0
+
+    def append(self, wav_path: str) -> None:
+        """Appends the audio of one WAV file to the output.
+
+        Args:
+            wav_path: The WAV file to append.
+
+        Raises:
+            ValueError: If the file's audio format differs from the first file's.
+            wave.Error: If the file is not a PCM WAV file.
+            EOFError: If the file holds less audio than its header states.
+        """
+        wav_file, params, data_size = _open_pcm_data(wav_path)
+        with wav_file:
+            if self._output is None:
+                self._output = open(self.output_path, "wb", buffering=0)
+                self._output.write(_pcm_wav_header(*params, 0))  # Sizes are filled in on close
+                self._params = params
+            elif params != self._params:
+                raise ValueError(f"{wav_path} has audio format {params}, expected {self._params}")
+            copied = _copy_to(wav_file, self._output, data_size)
+            self._data_size += copied
+            if copied != data_size:
+                raise EOFError(f"{wav_path} is shorter than its header states")
+        self.segment_count += 1
+
+    def close(self) -> None:
+        """Fills in the WAV header sizes and closes the output file."""
+        if self._output is None:
+            return
+        try:
+            if self._data_size % 2:
+                self._output.write(b"\x00")  # RIFF chunks are padded to an even size
+            self._output.seek(0)
+            self._output.write(_pcm_wav_header(*self._params, self._data_size))
+        finally:
+            self._output.close()
+            self._output = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
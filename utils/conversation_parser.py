@@ -1,80 +1,119 @@
+import io
 import logging
 import re
-from typing import List, Tuple, Dict
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Default Kokoro voice for each speaker the parser recognizes
+SPEAKER_VOICES = {
+    "Man": "am_adam",  # American male voice - strong and confident
+    "Woman": "af_heart",  # American female voice
+}
+DEFAULT_SPEAKER_VOICE = "af_heart"  # Used for unknown speakers
+
+# A speaker cue at the start of a line, e.g. "Man: Hello" or "WOMAN: Hi"
+_SPEAKER_CUE = re.compile(r"(?:(?P<man>Man|MAN|man)|Woman|WOMAN|woman):(?P<text>.*)")
 
-def extract_conversation_from_text(text_content: str) -> List[Tuple[str, str]]:
-    """Extracts speaker-separated dialogue from a raw text string.
 
-    This function parses a string assuming it contains a script-like
-    conversation, with lines prefixed by "Man:" or "Woman:". It handles
-    variations in capitalization and collects multiline dialogue for each
-    speaker.
+def iter_conversation_parts(text_content: str) -> Iterator[Tuple[str, str]]:
+    """Yields speaker-separated dialogue from a raw text string, one turn at a time.
+
+    This parses a string assuming it contains a script-like conversation,
+    with lines prefixed by "Man:" or "Woman:". It handles variations in
+    capitalization and collects multiline dialogue for each speaker. Lines
+    are read lazily, so no list of lines or turns is built.
 
     Args:
         text_content: A string containing the conversation. Expected format
             has speaker cues like "Man:" or "Woman:" at the beginning of
             their lines.
 
-    Returns:
-        A list of tuples, where each tuple contains the identified speaker
-        ('Man' or 'Woman') and their corresponding dialogue as a single string.
-        Returns an empty list if the input text is empty.
+    Yields:
+        Tuples of the identified speaker ('Man' or 'Woman') and their
+        corresponding dialogue as a single string, in script order. Turns
+        without any text are skipped.
     """
     if not text_content or not text_content.strip():
         logger.warning("No text content provided for conversation extraction.")
-        return []
-
-    # Normalize line endings
-    normalized_text = text_content.replace("\r\n", "\n").replace("\r", "\n")
-
-    # Split by newlines
-    lines = normalized_text.split("\n")
+        return
 
-    conversation_parts = []
     current_speaker = None
     current_text = []
 
-    # Process each line to extract speaker and text
-    for line in lines:
+    # newline=None normalizes \r\n and \r line endings while reading
+    for line in io.StringIO(text_content, newline=None):
         line = line.strip()
         if not line:
             continue
 
-        # Check for speaker patterns
-        man_match = re.match(r"^(?:Man|MAN|man):(.*)$", line)
-        woman_match = re.match(r"^(?:Woman|WOMAN|woman):(.*)$", line)
+        # Check for a speaker cue; one match covers both speakers
+        cue = _SPEAKER_CUE.match(line)
 
-        if man_match:
-            # If we have accumulated text for a previous speaker, save it
+        if cue:
+            # If we have accumulated text for a previous speaker, emit it
             if current_speaker and current_text:
-                conversation_parts.append((current_speaker, " ".join(current_text)))
+                yield current_speaker, " ".join(current_text)
                 current_text = []
 
-            current_speaker = "Man"
-            text_content = man_match.group(1).strip()
-            if text_content:
-                current_text.append(text_content)
-        elif woman_match:
-            # If we have accumulated text for a previous speaker, save it
-            if current_speaker and current_text:
-                conversation_parts.append((current_speaker, " ".join(current_text)))
-                current_text = []
-
-            current_speaker = "Woman"
-            text_content = woman_match.group(1).strip()
-            if text_content:
-                current_text.append(text_content)
+            current_speaker = "Man" if cue.group("man") else "Woman"
+            text = cue.group("text").strip()
+            if text:
+                current_text.append(text)
         elif current_speaker:  # Continue with the current speaker
             current_text.append(line)
 
-    # Add the last part if there's any
+    # Emit the last part if there's any
     if current_speaker and current_text:
-        conversation_parts.append((current_speaker, " ".join(current_text)))
+        yield current_speaker, " ".join(current_text)
+
+
+def coalesce_speaker_turns(parts: Iterable[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+    """Merges consecutive turns by the same speaker into a single turn.
+
+    A script that splits one speaker's lines over several cues would
+    otherwise be synthesized as many short pieces, each paying the engine's
+    per-call overhead. The merged text is joined with spaces, like the lines
+    within a turn.
+
+    Args:
+        parts: (speaker, text) tuples in script order, such as those from
+            `iter_conversation_parts`.
+
+    Yields:
+        (speaker, text) tuples in which no two consecutive turns share a
+        speaker.
+    """
+    current_speaker = None
+    current_text = []
+    for speaker, text in parts:
+        if speaker != current_speaker and current_text:
+            yield current_speaker, " ".join(current_text)
+            current_text = []
+        current_speaker = speaker
+        current_text.append(text)
+    if current_text:
+        yield current_speaker, " ".join(current_text)
+
+
+def extract_conversation_from_text(text_content: str) -> List[Tuple[str, str]]:
+    """Extracts speaker-separated dialogue from a raw text string.
+
+    This collects the turns of `iter_conversation_parts` into a list; see
+    there for the expected format.
 
-    logger.info(f"Extracted {len(conversation_parts)} conversation parts")
+    Args:
+        text_content: A string containing the conversation. Expected format
+            has speaker cues like "Man:" or "Woman:" at the beginning of
+            their lines.
+
+    Returns:
+        A list of tuples, where each tuple contains the identified speaker
+        ('Man' or 'Woman') and their corresponding dialogue as a single string.
+        Returns an empty list if the input text is empty.
+    """
+    conversation_parts = list(iter_conversation_parts(text_content))
+    logger.info("Extracted %s conversation parts", len(conversation_parts))
     return conversation_parts
 
 
@@ -98,10 +137,4 @@ def get_voice_for_speaker(speaker: str, voice_config: Dict = None) -> str:
     if voice_config and speaker in voice_config:
         return voice_config[speaker]
 
-    # Default mappings
-    voice_mapping = {
-        "Man": "am_adam",  # American male voice - strong and confident
-        "Woman": "af_heart",  # American female voice
-    }
-
-    return voice_mapping.get(speaker, "af_heart")  # Default to female voice if unknown
+    return SPEAKER_VOICES.get(speaker, DEFAULT_SPEAKER_VOICE)  # Default to female voice if unknown
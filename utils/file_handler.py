@@ -3,6 +3,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# get_safe_filename's rules for ASCII: alphanumerics, '.', '_' and '-' are kept
+# and everything else, spaces included, becomes '_'.
+_ASCII_SAFE_TABLE = str.maketrans({
+    chr(c): chr(c) if chr(c).isalnum() or chr(c) in "._-" else "_" for c in range(128)
+})
+
 
 def ensure_dir_exists(dir_path: str):
     """Checks if a directory exists at the given path and creates it if not.
@@ -15,13 +21,14 @@ def ensure_dir_exists(dir_path: str):
     """
     if not os.path.exists(dir_path):
         try:
-            os.makedirs(dir_path)
-            logger.info(f"Created directory: {dir_path}")
+            # exist_ok: another worker process may create it at the same time
+            os.makedirs(dir_path, exist_ok=True)
+            logger.info("Created directory: %s", dir_path)
         except OSError as e:
-            logger.error(f"Error creating directory {dir_path}: {e}")
+            logger.error("Error creating directory %s: %s", dir_path, e)
             raise
     else:
-        logger.debug(f"Directory already exists: {dir_path}")
+        logger.debug("Directory already exists: %s", dir_path)
 
 
 def get_safe_filename(name: str) -> str:
@@ -36,6 +43,10 @@ def get_safe_filename(name: str) -> str:
     Returns:
         A sanitized string suitable for use as a filename.
     """
+    if name.isascii():
+        # Segment names are built per segment, so the common case is one C-level pass
+        return name.translate(_ASCII_SAFE_TABLE)
+
     # Remove or replace characters not allowed in filenames
     # This is a basic version, more robust solutions might be needed for edge cases
     name = "".join(
@@ -43,3 +54,42 @@ def get_safe_filename(name: str) -> str:
     )
     name = name.replace(" ", "_")
     return name
+
+
+def index_segment_files(output_dir: str, job_name: str) -> dict[int, list[str]]:
+    """Finds a job's segment WAV files, grouped by chunk and in playback order.
+
+    Segment files are named `{job_name}_chunk_{chunk:04d}_segment_{seg:03d}.wav`
+    by the workers. The chunk and segment numbers are parsed once per file
+    while the directory is scanned, so ordering needs no per-comparison
+    filename parsing.
+
+    Args:
+        output_dir: The directory holding the job's audio files.
+        job_name: The name of the job (as given, before sanitizing).
+
+    Returns:
+        A dict mapping each chunk index to the paths of its segment files in
+        segment order. Keys are inserted in ascending chunk order. Empty if
+        the directory does not exist.
+    """
+    prefix = f"{get_safe_filename(job_name)}_chunk_"
+    keyed_paths = {}
+    try:
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith(prefix) and name.endswith(".wav")):
+                    continue
+                chunk_part, _, segment_part = name[len(prefix):-len(".wav")].partition("_segment_")
+                try:
+                    keyed_paths[(int(chunk_part), int(segment_part))] = entry.path
+                except ValueError:
+                    continue  # Another job's file that shares this prefix
+    except FileNotFoundError:
+        return {}
+
+    segments = {}
+    for (chunk_index, _), path in sorted(keyed_paths.items()):
+        segments.setdefault(chunk_index, []).append(path)
+    return segments
@@ -28,9 +28,11 @@ def setup_logging(level=logging.INFO, log_to_file=True, log_dir="logs", main_pro
     # Get the root logger
     root_logger = logging.getLogger()
 
-    # Avoid adding handlers multiple times
-    if root_logger.hasHandlers():
-        root_logger.handlers.clear()
+    # Avoid adding handlers multiple times; close the old ones so a replaced
+    # file handler does not keep its log file open
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+        handler.close()
 
     # Set the base level for the logger
     root_logger.setLevel(level)
@@ -8,7 +8,7 @@ import logging
 import os
 import sys
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -22,11 +22,14 @@ class ResourceConfig:
         max_torch_threads: Maximum PyTorch intra-op threads. None means no limit.
         max_gpu_memory_fraction: Maximum GPU memory fraction (0.0-1.0). None means no limit.
         low_priority: If True, lower the process priority.
+        cpu_cores: Specific CPU cores to pin the process to. Takes precedence
+            over max_cpu_cores. None means no explicit core set.
     """
     max_cpu_cores: Optional[int] = None
     max_torch_threads: Optional[int] = 4
     max_gpu_memory_fraction: Optional[float] = 0.75
     low_priority: bool = True
+    cpu_cores: Optional[List[int]] = None
 
 
 def get_cpu_count() -> int:
@@ -37,47 +40,109 @@ def get_cpu_count() -> int:
         return 1
 
 
-def set_cpu_affinity(max_cores: Optional[int] = None) -> bool:
+def _get_available_cores() -> List[int]:
+    """Get the CPU cores this process is currently allowed to run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(get_cpu_count()))
+
+
+# The cores this process could use before any worker pinning. Pinning narrows
+# the process's affinity, and a worker process may serve several jobs (the web
+# UI reuses its pool), so partitions are always taken from this original set.
+_INITIAL_CPU_CORES = _get_available_cores()
+
+
+def cap_workers_for_device(num_workers: int, device: Optional[str]) -> int:
+    """Limit the number of worker processes a compute device can serve well.
+    
+    Each worker loads its own copy of the model. On a GPU, concurrent
+    inference from several processes contends for the same device and
+    memory, so one worker keeping the GPU busy is faster than several.
+    
+    Args:
+        num_workers: The requested number of workers.
+        device: The job's compute device ('cuda', 'mps', 'cpu' or None for auto).
+    
+    Returns:
+        The number of workers to start.
+    """
+    if device in ('cuda', 'mps') and num_workers > 1:
+        logger.warning("%s device selected. Reducing workers from %s to 1; the GPU is shared by all workers.", device, num_workers)
+        return 1
+    return num_workers
+
+
+def partition_cpu_cores(worker_slot: int, worker_count: int, max_cores: Optional[int] = None) -> Optional[List[int]]:
+    """Pick a disjoint set of CPU cores for one of several worker processes.
+    
+    The cores this process could run on when it started (the first
+    `max_cores` of them, if given) are split into `worker_count` equal
+    contiguous slices, so an earlier pinning does not change the result.
+    Pinning each worker to its own slice keeps the workers' PyTorch thread
+    pools from competing for the same cores and keeps each worker's caches
+    warm.
+    
+    Args:
+        worker_slot: The worker's position in the pool, from 0.
+        worker_count: The number of workers sharing the cores.
+        max_cores: Maximum number of CPU cores all workers may use together.
+    
+    Returns:
+        The cores for this worker, or None if there are fewer cores than workers.
+    """
+    available = _INITIAL_CPU_CORES
+    if max_cores is not None:
+        available = available[:max_cores]
+    
+    cores_per_worker = len(available) // max(worker_count, 1)
+    if cores_per_worker == 0:
+        return None
+    return available[worker_slot * cores_per_worker:(worker_slot + 1) * cores_per_worker]
+
+
+def set_cpu_affinity(max_cores: Optional[int] = None, cores: Optional[List[int]] = None) -> bool:
     """Restrict the process to use only specific CPU cores.
     
     Args:
         max_cores: Maximum number of CPU cores to use. If None or >= available,
                    no restriction is applied.
+        cores: Specific cores to use instead of the first `max_cores` ones.
     
     Returns:
         True if affinity was set successfully, False otherwise.
     """
-    if max_cores is None:
+    if max_cores is None and not cores:
         return False
     
     total_cores = get_cpu_count()
-    if max_cores >= total_cores:
-        logger.debug(f"max_cores ({max_cores}) >= available ({total_cores}), skipping affinity.")
+    if not cores and max_cores >= total_cores:
+        logger.debug("max_cores (%s) >= available (%s), skipping affinity.", max_cores, total_cores)
         return False
     
     # Try using psutil if available (cross-platform)
     try:
         import psutil
         p = psutil.Process()
-        # Use first N cores
-        cores_to_use = list(range(min(max_cores, total_cores)))
+        # Use the given cores, or else the first N cores
+        cores_to_use = list(cores) if cores else list(range(min(max_cores, total_cores)))
         p.cpu_affinity(cores_to_use)
-        logger.info(f"CPU affinity set to cores: {cores_to_use}")
+        logger.info("CPU affinity set to cores: %s", cores_to_use)
         return True
     except ImportError:
         logger.debug("psutil not available for CPU affinity.")
     except Exception as e:
-        logger.warning(f"Failed to set CPU affinity via psutil: {e}")
+        logger.warning("Failed to set CPU affinity via psutil: %s", e)
     
     # Try using os.sched_setaffinity (Linux only)
     if hasattr(os, 'sched_setaffinity'):
         try:
-            cores_to_use = set(range(min(max_cores, total_cores)))
+            cores_to_use = set(cores) if cores else set(range(min(max_cores, total_cores)))
             os.sched_setaffinity(0, cores_to_use)
-            logger.info(f"CPU affinity set to cores: {cores_to_use}")
+            logger.info("CPU affinity set to cores: %s", cores_to_use)
             return True
         except Exception as e:
-            logger.warning(f"Failed to set CPU affinity via os.sched_setaffinity: {e}")
+            logger.warning("Failed to set CPU affinity via os.sched_setaffinity: %s", e)
     
     logger.debug("CPU affinity setting not supported on this platform.")
     return False
@@ -103,7 +168,7 @@ def set_process_priority(low_priority: bool = True) -> bool:
             logger.info("Process priority lowered via os.nice(10)")
             return True
         except Exception as e:
-            logger.warning(f"Failed to set nice value: {e}")
+            logger.warning("Failed to set nice value: %s", e)
     
     # Try using psutil (cross-platform, including Windows)
     try:
@@ -119,7 +184,7 @@ def set_process_priority(low_priority: bool = True) -> bool:
     except ImportError:
         logger.debug("psutil not available for priority setting.")
     except Exception as e:
-        logger.warning(f"Failed to set process priority via psutil: {e}")
+        logger.warning("Failed to set process priority via psutil: %s", e)
     
     return False
 
@@ -145,13 +210,13 @@ def set_torch_thread_limits(max_threads: Optional[int] = None) -> bool:
         # Limit inter-op parallelism (between operators)
         torch.set_num_interop_threads(max(1, max_threads // 2))
         
-        logger.info(f"PyTorch threads limited: num_threads={max_threads}, "
-                   f"interop_threads={max(1, max_threads // 2)}")
+        logger.info("PyTorch threads limited: num_threads=%s, interop_threads=%s",
+                   max_threads, max(1, max_threads // 2))
         return True
     except ImportError:
         logger.debug("PyTorch not available.")
     except Exception as e:
-        logger.warning(f"Failed to set PyTorch thread limits: {e}")
+        logger.warning("Failed to set PyTorch thread limits: %s", e)
     
     return False
 
@@ -189,17 +254,39 @@ def set_gpu_memory_limit(fraction: Optional[float] = None, device: Optional[str]
         # Also limit memory fragmentation by setting the max split size
         # This helps with memory efficiency
         if hasattr(torch.cuda, 'set_per_process_memory_fraction'):
-            logger.info(f"CUDA memory limited to {fraction * 100:.0f}% of available GPU memory")
+            logger.info("CUDA memory limited to %.0f%% of available GPU memory", fraction * 100)
             return True
             
     except ImportError:
         logger.debug("PyTorch not available.")
     except Exception as e:
-        logger.warning(f"Failed to set GPU memory limit: {e}")
+        logger.warning("Failed to set GPU memory limit: %s", e)
     
     return False
 
 
+def detect_best_device() -> str:
+    """Detect the fastest compute device PyTorch can use.
+    
+    Returns:
+        'cuda' if a CUDA GPU is available, otherwise 'mps' if Apple's Metal
+        backend is available, otherwise 'cpu'.
+    """
+    try:
+        import torch
+        
+        if torch.cuda.is_available():
+            return 'cuda'
+        if torch.backends.mps.is_available():
+            return 'mps'
+    except ImportError:
+        logger.debug("PyTorch not available.")
+    except Exception as e:
+        logger.debug("Could not detect compute device: %s", e)
+    
+    return 'cpu'
+
+
 def set_environment_limits(max_threads: Optional[int] = None) -> None:
     """Set environment variables that affect threading before importing heavy libraries.
     
@@ -228,7 +315,7 @@ def set_environment_limits(max_threads: Optional[int] = None) -> None:
     # Limit PyTorch's use of all cores
     os.environ.setdefault('TORCH_NUM_THREADS', thread_str)
     
-    logger.debug(f"Environment thread limits set to {max_threads}")
+    logger.debug("Environment thread limits set to %s", max_threads)
 
 
 def apply_resource_limits(config: Optional[ResourceConfig] = None, device: Optional[str] = None) -> dict:
@@ -254,20 +341,20 @@ def apply_resource_limits(config: Optional[ResourceConfig] = None, device: Optio
         'gpu_memory': False,
     }
     
-    logger.info(f"Applying resource limits: max_cpu_cores={config.max_cpu_cores}, "
-               f"max_torch_threads={config.max_torch_threads}, "
-               f"max_gpu_memory={config.max_gpu_memory_fraction}, "
-               f"low_priority={config.low_priority}")
+    logger.info("Applying resource limits: max_cpu_cores=%s, max_torch_threads=%s, "
+               "max_gpu_memory=%s, low_priority=%s",
+               config.max_cpu_cores, config.max_torch_threads,
+               config.max_gpu_memory_fraction, config.low_priority)
     
     # Apply limits
-    results['cpu_affinity'] = set_cpu_affinity(config.max_cpu_cores)
+    results['cpu_affinity'] = set_cpu_affinity(config.max_cpu_cores, config.cpu_cores)
     results['process_priority'] = set_process_priority(config.low_priority)
     results['torch_threads'] = set_torch_thread_limits(config.max_torch_threads)
     results['gpu_memory'] = set_gpu_memory_limit(config.max_gpu_memory_fraction, device)
     
     applied = [k for k, v in results.items() if v]
     if applied:
-        logger.info(f"Successfully applied resource limits: {', '.join(applied)}")
+        logger.info("Successfully applied resource limits: %s", ', '.join(applied))
     else:
         logger.info("No resource limits were applied (platform may not support them).")
     
@@ -291,7 +378,7 @@ def get_memory_info() -> dict:
     except ImportError:
         pass
     except Exception as e:
-        logger.debug(f"Could not get memory info: {e}")
+        logger.debug("Could not get memory info: %s", e)
     
     try:
         import torch
@@ -301,6 +388,6 @@ def get_memory_info() -> dict:
     except ImportError:
         pass
     except Exception as e:
-        logger.debug(f"Could not get GPU memory info: {e}")
+        logger.debug("Could not get GPU memory info: %s", e)
     
     return info
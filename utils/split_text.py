@@ -1,10 +1,23 @@
 import re
 import logging
+from typing import Iterable, Iterator
 
 logger = logging.getLogger(__name__)
 
+# Paragraph breaks or sentence endings. Compiled once at import so long inputs
+# and repeated calls never go back through `re`'s pattern cache.
+DEFAULT_SPLIT_PATTERN = re.compile(r"\n\n+|\r\n\r\n+|\n\s*\n+|[.!?]\s")
 
-def smart_split_text(text: str, split_pattern: str = r"\n\n+|\r\n\r\n+|\n\s*\n+|[.!?]\s") -> list[str]:
+# Two or more newlines, possibly with spaces in between
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n+")
+# Paragraph breaks, or the whitespace after a sentence ending (which stays
+# with its sentence)
+_SENTENCE_BOUNDARY = re.compile(r"\n\s*\n+|(?<=[.!?])\s")
+# Windows and old Mac line endings, rewritten to "\n" in a single pass
+_LINE_ENDING = re.compile(r"\r\n?")
+
+
+def smart_split_text(text: str, split_pattern: str | re.Pattern = DEFAULT_SPLIT_PATTERN) -> list[str]:
     """Intelligently splits a text into smaller, coherent segments for TTS.
 
     This function first checks if the text is short (based on line or character
@@ -14,32 +27,34 @@ def smart_split_text(text: str, split_pattern: str = r"\n\n+|\r\n\r\n+|\n\s*\n+|
 
     Args:
         text: The input string to be split.
-        split_pattern: A regular expression pattern used to split the text.
-            Defaults to a pattern that splits by paragraph breaks or sentence
-            endings.
+        split_pattern: A regular expression (string or precompiled
+            `re.Pattern`) used to split the text. Defaults to
+            `DEFAULT_SPLIT_PATTERN`, which splits by paragraph breaks or
+            sentence endings.
 
     Returns:
         A list of strings, where each string is a segment of the original
         text. Returns an empty list if the input text is empty.
     """
-    if not text or not text.strip():
+    if not text or text.isspace():  # isspace() scans without copying the text
         return []
     
     # Count lines and characters
     lines = text.split('\n')
-    line_count = len([line for line in lines if line.strip()])
+    line_count = sum(1 for line in lines if line and not line.isspace())
     char_count = len(text)
     
     # If text is short, don't split
     if line_count <= 5 or char_count <= 500:
-        logger.info(f"Text is short ({line_count} lines, {char_count} chars), not splitting.")
+        logger.info("Text is short (%s lines, %s chars), not splitting.", line_count, char_count)
         return [text.strip()]
     
     # Otherwise, split intelligently
     try:
-        parts = re.split(split_pattern, text)
+        pattern = re.compile(split_pattern) if isinstance(split_pattern, str) else split_pattern
+        parts = pattern.split(text)
         # Clean and filter
-        cleaned = [p.strip() for p in parts if p and p.strip()]
+        cleaned = [s for s in (p.strip() for p in parts if p) if s]
         if not cleaned:
             return [text.strip()]
         
@@ -56,13 +71,82 @@ def smart_split_text(text: str, split_pattern: str = r"\n\n+|\r\n\r\n+|\n\s*\n+|
         if current:
             merged.append(current)
         
-        logger.info(f"Smart split into {len(merged)} segments.")
+        logger.info("Smart split into %s segments.", len(merged))
         return merged
     except re.error:
         logger.warning("Invalid split pattern, using fallback.")
         return [text.strip()]
 
 
+def iter_paragraphs(text_pieces: Iterable[str]) -> Iterator[str]:
+    """Yields the paragraphs of a text that arrives in consecutive pieces.
+
+    The pieces (for example the pages of a PDF) are treated as one continuous
+    text, so a paragraph that spans two pieces is yielded whole. Only the
+    paragraph currently being read is held in memory.
+
+    Args:
+        text_pieces: The text, in order, split at arbitrary points.
+
+    Yields:
+        Each non-empty paragraph, stripped, in order.
+    """
+    current = []  # Parts of the paragraph being read
+    tail = ""  # Trailing whitespace a paragraph break may continue from
+    for piece in text_pieces:
+        if not piece:
+            continue
+        buffer = tail + piece
+        held = ""
+        if buffer.endswith("\r"):
+            # The "\n" of a "\r\n" may start the next piece
+            buffer, held = buffer[:-1], "\r"
+        normalized_text = _LINE_ENDING.sub("\n", buffer) if "\r" in buffer else buffer
+        parts = _PARAGRAPH_BREAK.split(normalized_text)
+        for part in parts[:-1]:
+            current.append(part)
+            paragraph = "".join(current).strip()
+            current = []
+            if paragraph:
+                yield paragraph
+        # A break consists of whitespace only, so only the last part's trailing
+        # whitespace needs to be scanned again with the next piece.
+        last = parts[-1]
+        body = last.rstrip()
+        current.append(body)
+        tail = last[len(body):] + held
+
+    paragraph = "".join(current).strip()
+    if paragraph:
+        yield paragraph
+
+
+def iter_text_chunks(text_pieces: Iterable[str], max_paragraphs_per_chunk: int = 30) -> Iterator[str]:
+    """Groups the paragraphs of a text arriving in pieces into chunks, lazily.
+
+    This is the streaming form of `split_text_into_chunks`: each chunk is
+    yielded as soon as its paragraphs have been read, so a large document
+    never has to be held in memory as a whole.
+
+    Args:
+        text_pieces: The text, in order, split at arbitrary points (see
+            `iter_paragraphs`).
+        max_paragraphs_per_chunk: The maximum number of paragraphs to include
+            in a single chunk.
+
+    Yields:
+        Chunks of one or more paragraphs joined by a blank line.
+    """
+    current_chunk_paragraphs = []
+    for para in iter_paragraphs(text_pieces):
+        current_chunk_paragraphs.append(para)
+        if len(current_chunk_paragraphs) >= max_paragraphs_per_chunk:
+            yield "\n\n".join(current_chunk_paragraphs)  # Rejoin with standard double newline
+            current_chunk_paragraphs = []
+    if current_chunk_paragraphs:
+        yield "\n\n".join(current_chunk_paragraphs)
+
+
 def split_text_into_chunks(
     full_text: str, max_paragraphs_per_chunk: int = 30
 ) -> list[str]:
@@ -83,41 +167,44 @@ def split_text_into_chunks(
         containing one or more paragraphs. Returns an empty list if the input
         text is empty.
     """
-    if not full_text or not full_text.strip():
-        return []
-
-    # Normalize newlines then split by patterns that likely indicate paragraph breaks
-    normalized_text = full_text.replace("\r\n", "\n").replace("\r", "\n")
-    # Split by two or more newlines, possibly with spaces in between
-    paragraphs = re.split(r"\n\s*\n+", normalized_text)
-    paragraphs = [p.strip() for p in paragraphs if p.strip()]
-
-    if (
-        not paragraphs
-    ):  # If no clear paragraph breaks, treat as one large paragraph block
-        if normalized_text.strip():
-            paragraphs = [normalized_text.strip()]
-        else:
-            return []
-
-    chunks = []
-    current_chunk_paragraphs = []
-    for i, para in enumerate(paragraphs):
-        current_chunk_paragraphs.append(para)
-        if len(current_chunk_paragraphs) >= max_paragraphs_per_chunk or (i + 1) == len(
-            paragraphs
-        ):
-            chunks.append(
-                "\n\n".join(current_chunk_paragraphs)
-            )  # Rejoin with standard double newline
-            current_chunk_paragraphs = []
-
-    if not chunks and full_text.strip():  # Ensure at least one chunk if there's text
-        chunks = [
-            "\n\n".join(paragraphs)
-        ]  # Rejoin all found paragraphs if they didn't form a chunk
-
+    chunks = list(iter_text_chunks([full_text], max_paragraphs_per_chunk))
     logger.info(
-        f"Split text into {len(chunks)} chunks, targeting up to {max_paragraphs_per_chunk} paragraphs per chunk."
+        "Split text into %s chunks, targeting up to %s paragraphs per chunk.", len(chunks), max_paragraphs_per_chunk
     )
     return chunks
+
+
+def balance_chunks(chunks: list[str], min_chunks: int) -> list[str]:
+    """Splits chunks more finely when there are too few to keep all workers busy.
+
+    Workers claim whole chunks, so a document that yields fewer chunks than
+    there are workers leaves some of them idle while one works through a
+    large chunk alone. In that case the chunks are broken into their
+    segments at paragraph and sentence boundaries (see `smart_split_text`)
+    and regrouped, in order, into about `min_chunks` chunks. Unlike
+    `DEFAULT_SPLIT_PATTERN`, the split keeps each sentence's final
+    punctuation, which the voice needs for its intonation.
+
+    Args:
+        chunks: The chunks from `split_text_into_chunks`.
+        min_chunks: The number of chunks wanted, typically a small multiple
+            of the number of workers.
+
+    Returns:
+        The original chunks if there are already enough of them (or they
+        cannot be split further), otherwise the regrouped chunks.
+    """
+    if len(chunks) >= min_chunks:
+        return chunks
+
+    segments = [segment for chunk in chunks for segment in smart_split_text(chunk, _SENTENCE_BOUNDARY)]
+    if len(segments) <= len(chunks):
+        return chunks
+
+    segments_per_chunk = -(-len(segments) // min_chunks)  # Ceiling division
+    balanced = [
+        "\n\n".join(segments[i:i + segments_per_chunk])
+        for i in range(0, len(segments), segments_per_chunk)
+    ]
+    logger.info("Re-split %s chunks into %s to balance the workers.", len(chunks), len(balanced))
+    return balanced
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+from utils.file_handler import ensure_dir_exists
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tts-app", "segments")
+DEFAULT_MAX_ENTRIES = 4096
+
+# Job options that change the generated audio, and therefore the cache key.
+CACHE_KEY_FIELDS = (
+    'engine', 'lang', 'voice', 'speed', 'dtype',
+    'cb_audio_prompt', 'cb_voice_cloning', 'cb_temperature', 'cb_top_p', 'cb_repetition_penalty',
+)
+
+
+def _link_or_copy(src_path: str, dest_path: str) -> None:
+    """Places `src_path` at `dest_path`, replacing any existing file atomically.
+
+    A hard link is used so no audio is copied; when linking is not possible
+    (a different filesystem, or no hard link support) the file is copied.
+    Because entries and outputs may share an inode, a linked file must be
+    replaced rather than rewritten in place.
+
+    Raises:
+        FileNotFoundError: If `src_path` does not exist.
+        OSError: If the file could neither be linked nor copied.
+    """
+    tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+    try:
+        os.link(src_path, tmp_path)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        shutil.copyfile(src_path, tmp_path)
+    try:
+        # Atomic, so other processes never see a partially written file
+        os.replace(tmp_path, dest_path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+
+
+class SynthesisCache:
+    """A content-addressed, on-disk cache of synthesized text segments.
+
+    Each entry is a WAV file named after the SHA-256 of the segment text and
+    the job options that affect the audio, so re-running a job (for example
+    after editing one paragraph of a document) only synthesizes segments that
+    actually changed. Entries are plain files and the least recently used
+    ones are evicted by modification time, so several worker processes can
+    share one cache directory without a common index.
+
+    Attributes:
+        cache_dir (str): The directory holding the cached WAV files.
+        max_entries (int): The number of entries kept before evicting.
+    """
+
+    def __init__(self, settings, cache_dir: str = DEFAULT_CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initializes the cache for one set of generation options.
+
+        Args:
+            settings: A mapping with the job's options (a jobs row or the
+                parsed CLI arguments as a dict); see `CACHE_KEY_FIELDS`.
+            cache_dir: The directory to keep cached segments in.
+            max_entries: The number of entries kept before the least
+                recently used ones are evicted.
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._params = json.dumps({field: settings[field] for field in CACHE_KEY_FIELDS}, sort_keys=True)
+        ensure_dir_exists(cache_dir)
+        self._entry_count = sum(1 for entry in os.scandir(cache_dir) if entry.name.endswith(".wav"))
+
+    def make_key(self, text: str, voice: str | None = None) -> str:
+        """Returns the cache key of a text segment under this cache's options.
+
+        Args:
+            text: The segment text.
+            voice: A voice overriding the job's voice for this segment, if any.
+        """
+        return hashlib.sha256(f"{self._params}\n{voice or ''}\n{text}".encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def fetch(self, key: str, dest_path: str) -> bool:
+        """Places a cached segment at `dest_path` if it is in the cache.
+
+        The output is hard-linked to the entry when possible, so a hit costs
+        no audio I/O. Anything rewriting the output must therefore replace
+        the file instead of writing into it.
+
+        Args:
+            key: The key from `make_key`.
+            dest_path: Where the audio file should be written.
+
+        Returns:
+            True on a cache hit, False otherwise.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            _link_or_copy(entry_path, dest_path)
+            os.utime(entry_path)  # Mark as recently used
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning("Could not read cached segment %s: %s", entry_path, e)
+            return False
+        logger.debug("Synthesis cache hit for %s", dest_path)
+        return True
+
+    def store(self, key: str, src_path: str) -> None:
+        """Adds a freshly synthesized segment to the cache, by hard link when possible.
+
+        Args:
+            key: The key from `make_key`.
+            src_path: The generated audio file to cache.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            _link_or_copy(src_path, entry_path)
+        except OSError as e:
+            logger.warning("Could not add %s to the synthesis cache: %s", src_path, e)
+            return
+        self._entry_count += 1
+        if self._entry_count > self.max_entries:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Removes the least recently used entries.
+
+        The cache is trimmed to 90% of `max_entries` so eviction, which scans
+        the whole directory, does not run again on the very next store.
+        """
+        entries = sorted(
+            (entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".wav")),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        excess = max(0, len(entries) - int(self.max_entries * 0.9))
+        for entry in entries[:excess]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass  # Already evicted by another process
+        self._entry_count = len(entries) - excess
+        logger.info("Evicted %s entries from the synthesis cache.", excess)
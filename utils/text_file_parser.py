@@ -1,7 +1,12 @@
+import codecs
 import logging
+from typing import Iterator
 
 logger = logging.getLogger(__name__)
 
+# Bytes read per block by iter_text_file
+READ_BLOCK_SIZE = 1 << 20
+
 
 def extract_text_from_txt(txt_path: str) -> str | None:
     """Reads and returns the content of a plain text file.
@@ -19,28 +24,82 @@ def extract_text_from_txt(txt_path: str) -> str | None:
         during reading, even with the fallback encoding.
     """
     try:
-        logger.info(f"Attempting to open text file: {txt_path}")
+        logger.info("Attempting to open text file: %s", txt_path)
         with open(txt_path, "r", encoding="utf-8") as file:
             content = file.read()
-        logger.info(f"Successfully extracted text from {txt_path}")
+        logger.info("Successfully extracted text from %s", txt_path)
         return content
     except FileNotFoundError:
-        logger.error(f"Text file not found: {txt_path}")
+        logger.error("Text file not found: %s", txt_path)
         return None
     except UnicodeDecodeError:
-        logger.warning(f"Could not decode {txt_path} as UTF-8. Trying with 'latin-1'.")
+        logger.warning("Could not decode %s as UTF-8. Trying with 'latin-1'.", txt_path)
         try:
             with open(txt_path, "r", encoding="latin-1") as file:  # Fallback encoding
                 content = file.read()
             logger.info(
-                f"Successfully extracted text from {txt_path} using latin-1 encoding."
+                "Successfully extracted text from %s using latin-1 encoding.", txt_path
             )
             return content
         except Exception as e:
-            logger.error(f"Failed to read {txt_path} even with latin-1: {e}")
+            logger.error("Failed to read %s even with latin-1: %s", txt_path, e)
             return None
     except Exception as e:
         logger.error(
-            f"An unexpected error occurred while processing text file {txt_path}: {e}"
+            "An unexpected error occurred while processing text file %s: %s", txt_path, e
         )
         return None
+
+
+def iter_text_file(txt_path: str, block_size: int = READ_BLOCK_SIZE) -> Iterator[str]:
+    """Yields the content of a plain text file one block at a time.
+
+    This is the streaming counterpart of `extract_text_from_txt`: only one
+    block is held in memory, however large the file. The file is decoded as
+    UTF-8; from the first block that is not valid UTF-8 on, it is decoded as
+    'latin-1' instead. For files that were plain ASCII up to that point this
+    gives the same text as `extract_text_from_txt`. Line endings are passed
+    through unchanged (see `utils.split_text.iter_paragraphs`).
+
+    Args:
+        txt_path: The local filesystem path to the .txt file.
+        block_size: The number of bytes to read at a time.
+
+    Yields:
+        Consecutive pieces of the file's text.
+
+    Raises:
+        OSError: If the file cannot be opened or read. Unlike
+            `extract_text_from_txt`, errors are raised, not just logged.
+    """
+    logger.info("Attempting to open text file: %s", txt_path)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    encoding = "utf-8"
+    all_ascii = True
+    with open(txt_path, "rb") as file:
+        while block := file.read(block_size):
+            if encoding == "utf-8":
+                pending = decoder.getstate()[0]  # Bytes of a character split across blocks
+                try:
+                    text = decoder.decode(block)
+                except UnicodeDecodeError:
+                    if all_ascii:
+                        logger.warning("Could not decode %s as UTF-8. Trying with 'latin-1'.", txt_path)
+                    else:
+                        logger.warning("%s is not entirely UTF-8; decoding the rest as 'latin-1'.", txt_path)
+                    encoding = "latin-1"
+                    block = pending + block
+            if encoding == "latin-1":
+                text = block.decode("latin-1")
+            all_ascii = all_ascii and text.isascii()
+            if text:
+                yield text
+        if encoding == "utf-8":
+            pending = decoder.getstate()[0]
+            try:
+                text = decoder.decode(b"", final=True)
+            except UnicodeDecodeError:
+                text = pending.decode("latin-1")
+            if text:
+                yield text
+    logger.info("Successfully extracted text from %s", txt_path)
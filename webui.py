@@ -1,23 +1,23 @@
-import gradio as gr
 import os
 import logging
 from pathlib import Path
 from datetime import datetime
 from concurrent.futures import ProcessPoolExecutor, as_completed
-import natsort
-import pandas as pd
+from concurrent.futures.process import BrokenProcessPool
 import sys
-import glob
+import threading
 
 # Local imports
+# gradio, pandas, the PDF parser and pydub are imported where they are used:
+# worker processes are started with 'spawn' and re-import this module, so
+# keeping them out of the module top keeps every worker's start-up light.
 import database as db
 from utils.logger import setup_logging
-from worker import process_chunk_worker
-from utils.pdf_parser import extract_text_from_pdf
+from worker import WORKER_MP_CONTEXT, process_chunk_worker
 from utils.text_file_parser import extract_text_from_txt
-from utils.split_text import split_text_into_chunks
-from utils.audio_merger import merge_audio_files
-from utils.file_handler import ensure_dir_exists
+from utils.split_text import balance_chunks, split_text_into_chunks
+from utils.file_handler import ensure_dir_exists, index_segment_files
+from utils.resource_limiter import cap_workers_for_device
 
 # Adjust path to import from sibling directories
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -25,11 +25,48 @@ if SCRIPT_DIR not in sys.path:
     sys.path.insert(0, SCRIPT_DIR)
 
 # --- Logging Setup ---
-setup_logging(main_process=True)
+# Configured by the entry point below, not at import: spawned worker processes
+# re-import this module and must not open the log file too.
 logger = logging.getLogger(__name__)
 # ---
 
-def run_job_processing(job_name, num_workers):
+# Worker processes are kept between jobs so each loads its TTS engine once
+# rather than once per job (see worker.get_tts_processor). The pool is only
+# replaced when a job asks for a different number of workers.
+_worker_pool = None
+_worker_pool_size = 0
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool(num_workers):
+    """Returns the shared worker pool, (re)creating it with `num_workers` processes if needed.
+
+    Args:
+        num_workers: The number of worker processes the job needs.
+
+    Returns:
+        A ProcessPoolExecutor with exactly `num_workers` processes.
+    """
+    global _worker_pool, _worker_pool_size
+    with _worker_pool_lock:
+        if _worker_pool is None or _worker_pool_size != num_workers:
+            if _worker_pool is not None:
+                _worker_pool.shutdown()  # Waits for any job still using it
+            _worker_pool = ProcessPoolExecutor(max_workers=num_workers, mp_context=WORKER_MP_CONTEXT)
+            _worker_pool_size = num_workers
+        return _worker_pool
+
+
+def discard_worker_pool(pool):
+    """Drops a pool whose processes died so the next job starts a fresh one."""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is pool:
+            _worker_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_job_processing(job_name, num_workers, prepare_chunks=None):
     """Synchronously runs the ProcessPoolExecutor for a given job and waits for it to complete.
 
     This function orchestrates the multiprocessing task, distributing the
@@ -40,6 +77,11 @@ def run_job_processing(job_name, num_workers):
     Args:
         job_name: The unique name of the job to process.
         num_workers: The number of parallel processes to spawn.
+        prepare_chunks: Optional callable taking (conn, job_id) that creates
+            the chunks of a job still in the 'preparing' state. It is run
+            once the workers have been started, so they load their TTS engine
+            while the input is read, and must return False if no chunks
+            could be created.
 
     Returns:
         True if the job completed successfully (all chunks processed),
@@ -50,16 +92,28 @@ def run_job_processing(job_name, num_workers):
         return False
     
     try:
-        logger.info(f"Starting ProcessPoolExecutor with {num_workers} workers for job '{job_name}'.")
-        job_id = db.get_job_by_name(db_conn, job_name)['id']
-        db.update_job_status(db_conn, job_id, 'processing')
-        
-        with ProcessPoolExecutor(max_workers=num_workers) as executor:
-            futures = [executor.submit(process_chunk_worker, job_name) for _ in range(num_workers)]
+        job = db.get_job_by_name(db_conn, job_name)
+        job_id = job['id']
+        num_workers = cap_workers_for_device(num_workers, job['device'])
+        logger.info("Running job '%s' on %s worker processes.", job_name, num_workers)
+        if prepare_chunks is None:
+            db.update_job_status(db_conn, job_id, 'processing')
+
+        job_prepared = True
+        executor = get_worker_pool(num_workers)
+        try:
+            futures = [executor.submit(process_chunk_worker, job_name, slot, num_workers) for slot in range(num_workers)]
+            if prepare_chunks is not None:
+                job_prepared = prepare_chunks(db_conn, job_id)
             for future in as_completed(futures):
                 future.result() # Wait for all workers to complete
-        
-        logger.info(f"All workers have finished for job '{job_name}'.")
+        except BrokenProcessPool:
+            discard_worker_pool(executor)
+            raise
+
+        logger.info("All workers have finished for job '%s'.", job_name)
+        if not job_prepared:
+            return False
 
         stats = db.get_job_stats(db_conn, job_id)
 
@@ -70,7 +124,7 @@ def run_job_processing(job_name, num_workers):
             db.update_job_status(db_conn, job_id, 'failed')
             return False
     finally:
-        db_conn.close()
+        db.close_connection(db_conn)
 
 def create_and_run_job(
     file_obj, text_input, num_workers, paragraphs_per_chunk,
@@ -102,6 +156,8 @@ def create_and_run_job(
         A tuple of Gradio updates for the status box, audio output, and
         button states.
     """
+    import gradio as gr
+
     db_conn = db.create_connection()
     if not db_conn:
         yield "Error: Could not connect to the database.", None, gr.update(interactive=True), gr.update(interactive=True)
@@ -109,22 +165,25 @@ def create_and_run_job(
     db.create_tables(db_conn)
 
     try:
-        # --- Determine Job Name and Extract Text ---
-        text_to_process = ""
+        # --- Determine Job Name ---
         input_source_name = "direct_text"
         input_file_path = "direct_text"
         if file_obj is not None:
             input_file_path = file_obj.name
             input_source_name = Path(input_file_path).stem
+            # Checked before the job is created, so a bad upload leaves no job behind
             file_ext = Path(input_file_path).suffix.lower()
-            if file_ext == '.pdf':
-                text_to_process = extract_text_from_pdf(input_file_path)
-            elif file_ext in ['.txt', '.md']:
-                text_to_process = extract_text_from_txt(input_file_path)
-        elif text_input:
-            text_to_process = text_input
-        
-        if not text_to_process.strip():
+            if file_ext not in ('.pdf', '.txt', '.md'):
+                yield f"Error: Unsupported file type '{file_ext}'. Upload a PDF, TXT or MD file.", None, gr.update(interactive=True), gr.update(interactive=True)
+                return
+            try:
+                file_size = os.path.getsize(input_file_path)
+            except OSError:
+                file_size = 0
+            if not file_size:
+                yield "Error: The uploaded file is empty or could not be read.", None, gr.update(interactive=True), gr.update(interactive=True)
+                return
+        elif not text_input or text_input.isspace():
             yield "Error: No text to process.", None, gr.update(interactive=True), gr.update(interactive=True)
             return
 
@@ -144,28 +203,59 @@ def create_and_run_job(
             yield f"Error: Job '{job_name}' already exists or could not be created.", None, gr.update(interactive=True), gr.update(interactive=True)
             return
 
-        text_chunks = split_text_into_chunks(text_to_process, paragraphs_per_chunk)
-        db.create_chunks(db_conn, job_id, text_chunks)
+        # Workers start polling for chunks while the input is still being read
+        db.update_job_status(db_conn, job_id, 'preparing')
+
+        def prepare_chunks(conn, job_id):
+            """Extracts the input text and stores its chunks, failing the job if it has no text."""
+            try:
+                text_to_process = text_input
+                if file_obj is not None:
+                    if file_ext == '.pdf':
+                        from utils.pdf_parser import extract_text_from_pdf
+
+                        text_to_process = extract_text_from_pdf(input_file_path)
+                    else:
+                        text_to_process = extract_text_from_txt(input_file_path)
+
+                if not text_to_process or text_to_process.isspace():
+                    logger.error("No text to process for job '%s'.", job_name)
+                    db.update_job_status(conn, job_id, 'failed')
+                    return False
+
+                text_chunks = split_text_into_chunks(text_to_process, paragraphs_per_chunk)
+                # Enough chunks that no worker sits idle while another finishes
+                text_chunks = balance_chunks(text_chunks, int(num_workers) * 4)
+                db.create_chunks(conn, job_id, text_chunks)
+            except BaseException:
+                # Never leave workers waiting on a job that will not get chunks
+                db.update_job_status(conn, job_id, 'failed')
+                raise
+            db.update_job_status(conn, job_id, 'processing')
+            logger.info("Job '%s' created with %s chunks.", job_name, len(text_chunks))
+            return True
 
         # --- Run Processing ---
-        status_message = f"Job '{job_name}' created with {len(text_chunks)} chunks. Processing..."
+        status_message = f"Job '{job_name}' created. Reading input and processing..."
         yield status_message, None, gr.update(interactive=False), gr.update(interactive=False)
 
-        job_successful = run_job_processing(job_name, num_workers)
+        job_successful = run_job_processing(job_name, num_workers, prepare_chunks)
 
         # --- Finalize and Return Result ---
         if job_successful:
             job_data = db.get_job_by_name(db_conn, job_name)
             if job_data['merge_output']:
                 # We must regather all segment files from the filesystem, as the DB only stores one representative path per chunk
-                pattern = os.path.join(job_data['output_dir'], f"{job_name}_chunk_*_segment_*.wav")
-                audio_files = glob.glob(pattern)
-                if audio_files:
-                    sorted_files = natsort.natsorted(audio_files)
+                segments = index_segment_files(job_data['output_dir'], job_name)
+                sorted_files = [path for chunk_files in segments.values() for path in chunk_files]
+                if sorted_files:
+                    from utils.audio_merger import merge_audio_files, merge_wav_files
+
                     merged_filename = f"{job_name}_merged.wav"
                     merged_path = os.path.join(job_data['output_dir'], merged_filename)
                     ensure_dir_exists(job_data['output_dir'])
-                    merge_audio_files(sorted_files, merged_path)
+                    if not merge_wav_files(sorted_files, merged_path):
+                        merge_audio_files(sorted_files, merged_path)
                     yield f"Job '{job_name}' completed and merged successfully!", merged_path, gr.update(interactive=True), gr.update(interactive=True)
                 else:
                     yield f"Job '{job_name}' completed, but no audio files found to merge.", None, gr.update(interactive=True), gr.update(interactive=True)
@@ -175,7 +265,7 @@ def create_and_run_job(
             yield f"Error: Job '{job_name}' failed or completed with errors.", None, gr.update(interactive=True), gr.update(interactive=True)
 
     finally:
-        db_conn.close()
+        db.close_connection(db_conn)
 
 def get_jobs_df():
     """Fetches all jobs from the database and formats them for display in a DataFrame.
@@ -184,18 +274,18 @@ def get_jobs_df():
         A pandas.DataFrame containing the list of all jobs, with columns
         renamed for presentation.
     """
-    db_conn = db.create_connection()
+    import pandas as pd
+
+    # Dashboard refreshes reuse the handler thread's read-only connection.
+    db_conn = db.get_reader_connection()
     if not db_conn:
         return pd.DataFrame()
-    try:
-        jobs = db.get_all_jobs(db_conn)
-        if not jobs:
-            return pd.DataFrame(columns=['ID', 'Job Name', 'Status', 'Created At'])
-        df = pd.DataFrame(jobs)
-        df = df.rename(columns={'id': 'ID', 'job_name': 'Job Name', 'status': 'Status', 'created_at': 'Created At'})
-        return df
-    finally:
-        db_conn.close()
+    jobs = db.get_all_jobs(db_conn)
+    if not jobs:
+        return pd.DataFrame(columns=['ID', 'Job Name', 'Status', 'Created At'])
+    df = pd.DataFrame(jobs)
+    df = df.rename(columns={'id': 'ID', 'job_name': 'Job Name', 'status': 'Status', 'created_at': 'Created At'})
+    return df
 
 def create_ui():
     """Builds and configures the entire Gradio user interface.
@@ -208,6 +298,8 @@ def create_ui():
     Returns:
         A Gradio Blocks interface object.
     """
+    import gradio as gr
+
     with gr.Blocks(title="TTS App - Advanced", theme=gr.themes.Monochrome()) as interface:
         gr.Markdown("# 🎵 TTS: Scalable Text-to-Speech")
         
@@ -280,11 +372,13 @@ def create_ui():
     return interface
 
 if __name__ == "__main__":
+    setup_logging(main_process=True)
+
     # Initialize the database and tables on startup
     init_db_conn = db.create_connection()
     if init_db_conn:
         db.create_tables(init_db_conn)
-        init_db_conn.close()
+        db.close_connection(init_db_conn)
 
     ui = create_ui()
     ui.launch(server_name="0.0.0.0", server_port=7860, share=False)
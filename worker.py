@@ -1,19 +1,310 @@
+import contextlib
 import logging
+import multiprocessing
 import os
+import tempfile
+import time
 
-# Set environment limits BEFORE importing torch/heavy libs
-# This is critical as PyTorch reads these at import time
-from utils.resource_limiter import ResourceConfig, apply_resource_limits, set_environment_limits
-
-# Apply environment-level thread limits early (before torch import)
-set_environment_limits(max_threads=4)  # Default conservative limit
-
+from utils.resource_limiter import ResourceConfig, apply_resource_limits, detect_best_device, partition_cpu_cores, set_environment_limits
 import database as db
-from utils.file_handler import ensure_dir_exists
+from utils.file_handler import ensure_dir_exists, get_safe_filename
 from utils.split_text import smart_split_text
 from utils.logger import setup_logging
+from utils.synthesis_cache import SynthesisCache
+
+# Chunk status updates are buffered per worker and written in one transaction
+# once this many have accumulated or this many seconds have passed.
+STATUS_FLUSH_SIZE = 32
+STATUS_FLUSH_INTERVAL = 5.0
+
+# While a new job is still 'preparing' (its input is being parsed and chunked),
+# idle workers poll for chunks at this interval instead of exiting.
+PREPARING_POLL_INTERVAL = 0.5
+
+# Worker pools start their processes with 'spawn': each worker gets a fresh
+# interpreter instead of a fork of a parent that may be running threads or
+# holding SQLite handles and a CUDA context. Workers load their engine once.
+WORKER_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# Short text synthesized once by warm_up_processor.
+WARMUP_TEXT = "Warming up."
+
+# The engine last created in this process and the options it was loaded with,
+# see get_tts_processor. Only one is kept so a process never holds two models.
+_cached_processor = None
+_cached_processor_key = None
+
+# Reduced-precision --dtype values and the torch dtype autocast runs them in.
+AUTOCAST_DTYPES = {'fp16': 'float16', 'bf16': 'bfloat16'}
+
+
+def resolve_autocast_dtype(dtype, device):
+    """Resolves a job's --dtype option to the dtype to autocast inference to.
+
+    Reduced precision is only applied on CUDA. 'auto' picks bfloat16 on GPUs
+    with compute capability 8.0 or newer (Ampere+) and float16 on older ones.
+    'int8' is applied to the model itself instead (see `create_tts_processor`).
+
+    Args:
+        dtype: The job's dtype option ('fp32', 'fp16', 'bf16', 'auto', 'int8'
+            or None).
+        device: The resolved compute device ('cuda', 'mps' or 'cpu').
+
+    Returns:
+        A torch.dtype to autocast to, or None to run in full precision.
+    """
+    import torch
+
+    if device != 'cuda' or dtype in (None, 'fp32', 'int8'):
+        if dtype not in (None, 'fp32', 'auto', 'int8'):
+            logging.getLogger(__name__).warning("dtype '%s' is only supported on CUDA; running in fp32 on '%s'.", dtype, device)
+        return None
+    if dtype == 'auto':
+        dtype = 'bf16' if torch.cuda.get_device_capability()[0] >= 8 else 'fp16'
+    return getattr(torch, AUTOCAST_DTYPES[dtype])
+
+
+def configure_inference(settings, worker_slot=None, worker_count=1):
+    """Prepares the current process for running a TTS engine.
+
+    Applies the thread, CPU and GPU limits from `settings` (this is where
+    torch is first imported), then resolves the compute device and the
+    inference precision.
+
+    Args:
+        settings: A mapping with the job's options, such as a jobs row or the
+            parsed CLI arguments as a dict ('engine', 'device', 'dtype',
+            'max_cpu_cores', 'max_torch_threads', 'max_gpu_memory' and
+            'low_priority').
+        worker_slot: This process's position in a pool of `worker_count`
+            workers. When given, the process is pinned to its own share of
+            the CPU cores and its thread count is capped to that share.
+        worker_count: The number of workers in the pool.
+
+    Returns:
+        A `(device, autocast_dtype)` tuple; see `resolve_autocast_dtype`.
+    """
+    logger = logging.getLogger(__name__)
+
+    # PyTorch only reads this at import time, and torch is first imported by
+    # apply_resource_limits below, so set it now. It lets ops that MPS does
+    # not implement fall back to the CPU instead of failing. An unset device
+    # may resolve to MPS below, so it gets the fallback too.
+    if settings['device'] in (None, 'mps'):
+        os.environ.setdefault('PYTORCH_ENABLE_MPS_FALLBACK', '1')
+
+    # Apply resource limits to prevent system overload
+    max_threads = settings['max_torch_threads']
+    # For Chatterbox, use more restrictive defaults
+    if settings['engine'] == 'chatterbox':
+        max_threads = min(max_threads, 2)  # Chatterbox needs fewer threads
+
+    cpu_cores = None
+    if worker_slot is not None and worker_count > 1:
+        cpu_cores = partition_cpu_cores(worker_slot, worker_count, settings['max_cpu_cores'])
+        if cpu_cores:
+            max_threads = min(max_threads, len(cpu_cores)) if max_threads else len(cpu_cores)
+
+    # OpenMP/MKL/BLAS read their thread counts once, when torch is imported by
+    # apply_resource_limits below, so size their pools to this job's budget now.
+    set_environment_limits(max_threads=max_threads)
+
+    resource_config = ResourceConfig(
+        max_cpu_cores=settings['max_cpu_cores'],
+        max_torch_threads=max_threads,
+        max_gpu_memory_fraction=settings['max_gpu_memory'],
+        low_priority=settings['low_priority'],
+        cpu_cores=cpu_cores,
+    )
+    apply_resource_limits(resource_config, device=settings['device'])
+
+    # Resolve the device once so the engine and its tensors stay on the GPU
+    # when one is present, and flag jobs that were explicitly pinned to CPU.
+    detected_device = detect_best_device()
+    device = settings['device'] or detected_device
+    if settings['device'] is None:
+        logger.info("No device given, using detected device '%s'.", device)
+    elif device == 'cpu' and detected_device != 'cpu':
+        logger.warning("GPU detected (%s) but device is 'cpu'; inference will be much slower.", detected_device)
+
+    autocast_dtype = resolve_autocast_dtype(settings['dtype'], device)
+    if autocast_dtype is not None:
+        logger.info("Running inference with %s autocast.", autocast_dtype)
+    return device, autocast_dtype
+
+
+def create_tts_processor(settings, device):
+    """Creates and configures the TTS engine selected by a job's options.
+
+    With dtype 'int8', a Kokoro model on the CPU is quantized to int8; other
+    engines and devices run in full precision.
+
+    Args:
+        settings: A mapping with the job's engine options, such as a jobs row
+            or the parsed CLI arguments as a dict ('engine', 'lang', 'voice',
+            'speed', 'dtype' and the 'cb_*' Chatterbox options).
+        device: The resolved compute device.
+
+    Returns:
+        The configured processor, or None if the engine is not supported.
+
+    Raises:
+        Exception: If the engine fails to initialize.
+    """
+    # This import needs to be inside the worker function for ProcessPoolExecutor
+    from tts_engine.processor import KokoroTTSProcessor
+    from tts_engine.chatterbox_processor import ChatterboxTTSProcessor
+
+    if settings['engine'] == 'kokoro':
+        tts_processor = KokoroTTSProcessor(lang_code=settings['lang'], device=device)
+    elif settings['engine'] == 'chatterbox':
+        tts_processor = ChatterboxTTSProcessor(
+            device=device,
+            enable_voice_cloning=settings['cb_voice_cloning']
+        )
+    else:
+        return None
+    if settings['dtype'] == 'int8':
+        if settings['engine'] == 'kokoro' and device == 'cpu':
+            tts_processor.quantize_int8()
+        else:
+            logging.getLogger(__name__).warning(
+                "dtype 'int8' is only supported for Kokoro on the CPU; running %s in fp32 on '%s'.", settings['engine'], device
+            )
+    set_processor_generation_params(tts_processor, settings)
+    return tts_processor
+
+
+def set_processor_generation_params(tts_processor, settings):
+    """Applies a job's voice and sampling options to a processor.
+
+    Args:
+        tts_processor: A processor from `create_tts_processor`.
+        settings: A mapping with the job's engine options; see
+            `create_tts_processor`.
+    """
+    if settings['engine'] == 'kokoro':
+        tts_processor.set_generation_params(voice=settings['voice'], speed=settings['speed'])
+    else:
+        tts_processor.set_generation_params(
+            audio_prompt_path=settings['cb_audio_prompt'],
+            temperature=settings['cb_temperature'],
+            top_p=settings['cb_top_p'],
+            repetition_penalty=settings['cb_repetition_penalty'],
+        )
+
+
+def get_tts_processor(settings, device, autocast_dtype=None):
+    """Returns a processor for a job, reusing the engine this process already loaded.
+
+    Loading a model takes far longer than most jobs' first chunk, and a pool
+    whose processes outlive one job (as in the web UI) would otherwise pay
+    it for every job. The engine is reused when the engine, language, device
+    voice cloning mode and dtype match the previous job's; only the generation
+    options are applied again. A newly created engine is warmed up if the
+    job asks for it (see `warm_up_processor`).
+
+    Args:
+        settings: A mapping with the job's options; see `create_tts_processor`
+            ('warmup' is also read).
+        device: The resolved compute device.
+        autocast_dtype: The precision segments will be generated with.
+
+    Returns:
+        The configured processor, or None if the engine is not supported.
+
+    Raises:
+        Exception: If the engine fails to initialize.
+    """
+    global _cached_processor, _cached_processor_key
+
+    key = (settings['engine'], settings['lang'], device, settings['cb_voice_cloning'], settings['dtype'])
+    if _cached_processor is not None and key == _cached_processor_key:
+        logging.getLogger(__name__).info("Reusing the %s engine already loaded in this process.", settings['engine'])
+        set_processor_generation_params(_cached_processor, settings)
+        return _cached_processor
+
+    # Release the previous model before loading the next one
+    _cached_processor = _cached_processor_key = None
+    tts_processor = create_tts_processor(settings, device)
+    if tts_processor is not None:
+        if settings['warmup']:
+            warm_up_processor(tts_processor, autocast_dtype)
+        _cached_processor, _cached_processor_key = tts_processor, key
+    return tts_processor
+
+
+def synthesize_segment(tts_processor, text, output_dir, base_filename, autocast_dtype=None, cache=None, voice=None):
+    """Synthesizes one pre-split text segment to a WAV file.
+
+    Args:
+        tts_processor: A processor from `create_tts_processor`.
+        text: The segment to convert to speech.
+        output_dir: The directory to write the audio file to. It must exist.
+        base_filename: The output file name, without the .wav extension.
+        autocast_dtype: Reduced-precision dtype to autocast to on CUDA, or
+            None for full precision.
+        cache: An optional SynthesisCache. On a hit the cached audio is
+            linked to the output file and the engine is not called; on a
+            miss the generated file is added to the cache.
+        voice: A voice overriding the processor's default for this segment,
+            such as a conversation speaker's voice (Kokoro only).
+
+    Returns:
+        A list with the path of the generated file, or an empty list on failure.
+    """
+    import torch
+
+    output_path = os.path.join(output_dir, f"{get_safe_filename(base_filename)}.wav")
+    if cache is not None:
+        cache_key = cache.make_key(text, voice)
+        if cache.fetch(cache_key, output_path):
+            return [output_path]
+
+    # A previous run may have left this file hard-linked to a cache entry;
+    # the engines write in place, which would overwrite the entry too.
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(output_path)
+
+    # Only inference runs here, so skip autograd's bookkeeping
+    precision = torch.autocast('cuda', dtype=autocast_dtype) if autocast_dtype else contextlib.nullcontext()
+    voice_kwargs = {'voice': voice} if voice else {}
+    with torch.inference_mode(), precision:
+        audio_files = tts_processor.text_to_speech(
+            text=text,
+            output_dir=output_dir,
+            base_filename=base_filename,
+            use_lock=False,
+            **voice_kwargs,
+        )
+    if cache is not None and audio_files:
+        cache.store(cache_key, audio_files[0])
+    return audio_files
+
+def warm_up_processor(tts_processor, autocast_dtype=None):
+    """Runs one short throwaway synthesis so later calls run at full speed.
+
+    The first generation pays one-off costs such as CUDA context set-up, MPS
+    graph compilation and lazy weight loading. Paying them here, while a new
+    job's input is still being prepared, keeps them off the first real chunk.
+    The audio is written to a temporary directory and discarded.
+
+    Args:
+        tts_processor: A processor from `create_tts_processor`.
+        autocast_dtype: The precision real segments will be generated with.
+    """
+    logger = logging.getLogger(__name__)
+    started = time.monotonic()
+    try:
+        with tempfile.TemporaryDirectory() as warmup_dir:
+            synthesize_segment(tts_processor, WARMUP_TEXT, warmup_dir, "_warmup", autocast_dtype)
+    except Exception as e:
+        logger.warning("Warm-up synthesis failed, continuing without it: %s", e)
+        return
+    logger.info("Warm-up synthesis took %.2fs.", time.monotonic() - started)
 
-def process_chunk_worker(job_name: str) -> int:
+
+def process_chunk_worker(job_name: str, worker_slot: int | None = None, worker_count: int = 1) -> int:
     """The main worker function that runs in a separate process to handle TTS.
 
     This function is designed to be executed by a process pool. It connects to
@@ -26,12 +317,19 @@ def process_chunk_worker(job_name: str) -> int:
     2. Initializes the appropriate TTS engine (Kokoro or Chatterbox).
     3. Splits the chunk's text into smaller, manageable segments.
     4. Calls the TTS engine to convert each segment into an audio file.
-    5. Updates the chunk's status to 'completed' or 'failed' in the database.
+    5. Records the chunk's status as 'completed' or 'failed'. Results are
+       buffered and written to the database in batches.
 
     The function exits when no more 'pending' chunks are available for the job.
+    While the job is still 'preparing' (its chunks are being created), the
+    worker waits for chunks instead of exiting, so engine initialization can
+    overlap input parsing.
 
     Args:
         job_name: The unique name of the job this worker should process.
+        worker_slot: This worker's position in the pool, from 0; used to pin
+            it to its own CPU cores (see `configure_inference`).
+        worker_count: The number of workers in the pool.
 
     Returns:
         The total number of chunks successfully processed by this worker instance.
@@ -42,106 +340,97 @@ def process_chunk_worker(job_name: str) -> int:
 
     db_conn = db.create_connection()
     if not db_conn:
-        worker_logger.error(f"Worker for job '{job_name}': Could not connect to database. Exiting.")
+        worker_logger.error("Worker for job '%s': Could not connect to database. Exiting.", job_name)
         return 0
 
     job_data = db.get_job_by_name(db_conn, job_name)
     if not job_data:
-        worker_logger.error(f"Worker for job '{job_name}': Could not find job data. Exiting.")
-        db_conn.close()
+        worker_logger.error("Worker for job '%s': Could not find job data. Exiting.", job_name)
+        db.close_connection(db_conn)
         return 0
 
-    # Apply resource limits to prevent system overload
-    max_threads = job_data.get('max_torch_threads', 4)
-    # For Chatterbox, use more restrictive defaults
-    if job_data.get('engine') == 'chatterbox':
-        max_threads = min(max_threads, 2)  # Chatterbox needs fewer threads
-    
-    resource_config = ResourceConfig(
-        max_cpu_cores=job_data.get('max_cpu_cores'),
-        max_torch_threads=max_threads,
-        max_gpu_memory_fraction=job_data.get('max_gpu_memory', 0.75),
-        low_priority=job_data.get('low_priority', True),
-    )
-    apply_resource_limits(resource_config, device=job_data.get('device'))
-
-    # This import needs to be inside the worker function for ProcessPoolExecutor
-    from tts_engine.processor import KokoroTTSProcessor
-    from tts_engine.chatterbox_processor import ChatterboxTTSProcessor
-
     try:
-        if job_data['engine'] == 'kokoro':
-            tts_processor = KokoroTTSProcessor(lang_code=job_data['lang'], device=job_data['device'])
-            tts_processor.set_generation_params(voice=job_data['voice'], speed=job_data['speed'])
-        elif job_data['engine'] == 'chatterbox':
-            tts_processor = ChatterboxTTSProcessor(
-                device=job_data['device'],
-                enable_voice_cloning=job_data.get('cb_voice_cloning', False)
-            )
-            tts_processor.set_generation_params(
-                audio_prompt_path=job_data['cb_audio_prompt'],
-
-                temperature=job_data['cb_temperature'],
-                top_p=job_data['cb_top_p'],
-                repetition_penalty=job_data['cb_repetition_penalty'],
-            )
-        else:
-            worker_logger.warning(f"Worker for job '{job_name}': Engine '{job_data['engine']}' is not supported.")
-            tts_processor = None
+        device, autocast_dtype = configure_inference(job_data, worker_slot, worker_count)
+        tts_processor = get_tts_processor(job_data, device, autocast_dtype)
+        if tts_processor is None:
+            worker_logger.warning("Worker for job '%s': Engine '%s' is not supported.", job_name, job_data['engine'])
+        cache = SynthesisCache(job_data, job_data['cache_dir']) if job_data['cache_dir'] else None
     except Exception as e:
-        worker_logger.error(f"Worker for job '{job_name}': Failed to initialize TTS processor: {e}. Exiting.", exc_info=True)
-        db_conn.close()
+        worker_logger.error("Worker for job '%s': Failed to initialize TTS processor: %s. Exiting.", job_name, e, exc_info=True)
+        db.close_connection(db_conn)
         return 0
 
-    worker_logger.info(f"Worker process {os.getpid()} started for job '{job_name}'.")
+    worker_logger.info("Worker process %s started for job '%s'.", os.getpid(), job_name)
     processed_count = 0
 
-    while True:
-        chunk = db.claim_chunk(db_conn, job_data['id'])
-        if not chunk:
-            worker_logger.info(f"Worker {os.getpid()}: No more pending chunks for job '{job_name}'. Exiting.")
-            break
-
-        try:
-            worker_logger.info(f"Worker {os.getpid()}: Processing chunk {chunk['chunk_index']} for job '{job_name}'.")
-            ensure_dir_exists(job_data['output_dir'])
-            base_filename = f"{job_name}_chunk_{chunk['chunk_index']:04d}"
-
-            # External segmentation to avoid double splitting inside processors
-            # We keep a minimal split pattern to rely on smart_split_text defaults
-            segments = smart_split_text(chunk['text'])
-            if not segments:
-                worker_logger.warning(f"Worker {os.getpid()}: Chunk {chunk['chunk_index']} produced no segments after splitting.")
-                db.update_chunk_status(db_conn, chunk['id'], 'failed')
-                continue
-
-            generated_files = []
-            for seg_idx, seg_text in enumerate(segments):
-                seg_base = f"{base_filename}_segment_{seg_idx:03d}"  # maintain compatibility with merger glob
-                # Pass pre_split=True so processor treats whole seg_text as single unit
-                audio_files = tts_processor.text_to_speech(
-                    text=seg_text,
-                    output_dir=job_data['output_dir'],
-                    base_filename=seg_base,
-                    use_lock=False,
-                )
-                if audio_files:
-                    generated_files.extend(audio_files)
+    # Buffered (status, audio_file_path, chunk_id) results, see db.flush_chunk_updates
+    pending_updates = []
+    last_flush = time.monotonic()
+
+    def flush_updates():
+        nonlocal last_flush
+        if db.flush_chunk_updates(db_conn, pending_updates):
+            pending_updates.clear()
+        last_flush = time.monotonic()
+
+    def record_chunk_status(chunk_id, status, audio_file_path=None):
+        pending_updates.append((status, audio_file_path, chunk_id))
+        if len(pending_updates) >= STATUS_FLUSH_SIZE or time.monotonic() - last_flush >= STATUS_FLUSH_INTERVAL:
+            flush_updates()
+
+    try:
+        while True:
+            chunk = db.claim_chunk(db_conn, job_data['id'])
+            if not chunk:
+                if db.get_job_status(db_conn, job_data['id']) == 'preparing':
+                    time.sleep(PREPARING_POLL_INTERVAL)
+                    continue
+                worker_logger.info("Worker %s: No more pending chunks for job '%s'. Exiting.", os.getpid(), job_name)
+                break
+
+            try:
+                worker_logger.info("Worker %s: Processing chunk %s for job '%s'.", os.getpid(), chunk['chunk_index'], job_name)
+                ensure_dir_exists(job_data['output_dir'])
+                base_filename = f"{job_name}_chunk_{chunk['chunk_index']:04d}"
+
+                # External segmentation to avoid double splitting inside processors
+                # We keep a minimal split pattern to rely on smart_split_text defaults
+                segments = smart_split_text(chunk['text'])
+                if not segments:
+                    worker_logger.warning("Worker %s: Chunk %s produced no segments after splitting.", os.getpid(), chunk['chunk_index'])
+                    record_chunk_status(chunk['id'], 'failed')
+                    continue
+
+                # Each segment is written to disk as soon as it is synthesized;
+                # only the first path (stored in the DB) and a count are kept.
+                first_file = None
+                file_count = 0
+                for seg_idx, seg_text in enumerate(segments):
+                    seg_base = f"{base_filename}_segment_{seg_idx:03d}"  # naming parsed by index_segment_files for merging
+                    audio_files = synthesize_segment(
+                        tts_processor, seg_text, job_data['output_dir'], seg_base, autocast_dtype, cache, chunk['voice']
+                    )
+                    if audio_files:
+                        first_file = first_file or audio_files[0]
+                        file_count += len(audio_files)
+                    else:
+                        worker_logger.warning("Worker %s: No audio returned for segment %s of chunk %s.", os.getpid(), seg_idx, chunk['chunk_index'])
+
+                if first_file:
+                    # For database we record first file (others share naming pattern)
+                    record_chunk_status(chunk['id'], 'completed', first_file)
+                    worker_logger.info("Worker %s: Successfully processed chunk %s into %s segment file(s).", os.getpid(), chunk['chunk_index'], file_count)
+                    processed_count += 1
                 else:
-                    worker_logger.warning(f"Worker {os.getpid()}: No audio returned for segment {seg_idx} of chunk {chunk['chunk_index']}.")
-
-            if generated_files:
-                # For database we record first file (others share naming pattern)
-                db.update_chunk_status(db_conn, chunk['id'], 'completed', generated_files[0])
-                worker_logger.info(f"Worker {os.getpid()}: Successfully processed chunk {chunk['chunk_index']} into {len(generated_files)} segment file(s).")
-                processed_count += 1
-            else:
-                db.update_chunk_status(db_conn, chunk['id'], 'failed')
-                worker_logger.warning(f"Worker {os.getpid()}: All segments failed for chunk {chunk['chunk_index']}.")
-
-        except Exception as e:
-            worker_logger.error(f"Worker {os.getpid()}: Error processing chunk {chunk['chunk_index']}: {e}", exc_info=True)
-            db.update_chunk_status(db_conn, chunk['id'], 'failed')
-
-    db_conn.close()
+                    record_chunk_status(chunk['id'], 'failed')
+                    worker_logger.warning("Worker %s: All segments failed for chunk %s.", os.getpid(), chunk['chunk_index'])
+
+            except Exception as e:
+                worker_logger.error("Worker %s: Error processing chunk %s: %s", os.getpid(), chunk['chunk_index'], e, exc_info=True)
+                record_chunk_status(chunk['id'], 'failed')
+    finally:
+        # Write any buffered results before the worker exits
+        flush_updates()
+
+    db.close_connection(db_conn)
     return processed_count